@@ -3,11 +3,11 @@ from allauth.socialaccount.adapter import DefaultSocialAccountAdapter
 from django.contrib.auth import get_user_model
 from django.utils.text import slugify
 from django.conf import settings
-from django.core.mail import send_mail
 from django.template.loader import render_to_string
 from django.utils.html import strip_tags
 import logging
 from rest_framework import serializers
+from jmw.background_utils import send_email_async
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
@@ -28,15 +28,15 @@ class CustomAccountAdapter(DefaultAccountAdapter):
         
         from_email = self.get_from_email()
         
-        send_mail(
+        # Sent from a background thread so signup / password reset requests
+        # don't wait on the SMTP server
+        send_email_async(
             subject=subject,
             message=plain_message,
             from_email=from_email,
             recipient_list=[email],
             html_message=html_message,
-            fail_silently=False,
         )
-        logger.info(f"Email sent to {email} with subject: {subject}")
     
     def save_user(self, request, user, form, commit=True):
         """Save user with additional fields."""
@@ -69,10 +69,8 @@ class CustomSocialAccountAdapter(DefaultSocialAccountAdapter):
         user = sociallogin.user
         
         if user.email:
-            existing_users = User.objects.filter(email=user.email)
-            if existing_users.exists():
-                existing_user = existing_users.first()
-                
+            existing_user = User.objects.filter(email=user.email).first()
+            if existing_user:
                 # Don't link if the existing user has a password (normal account)
                 # unless explicitly requested
                 if existing_user.has_usable_password():
@@ -625,6 +625,37 @@ class OrderEntryModelTest(TransactionTestCase):
         self.assertEqual(orders[1].serial_number, 2)
         self.assertEqual(orders[2].serial_number, 3)
 
+    def test_ordering_groups_by_newest_bulk_order(self):
+        """Test that entries follow BulkOrderLink's -created_at ordering, then serial_number"""
+        newer_bulk_order = BulkOrderLink.objects.create(
+            organization_name="Newer Org",
+            price_per_item=Decimal("5000.00"),
+            payment_deadline=timezone.now() + timedelta(days=30),
+            created_by=self.user
+        )
+        BulkOrderLink.objects.filter(pk=self.bulk_order.pk).update(
+            created_at=timezone.now() - timedelta(days=1)
+        )
+
+        for bulk_order in (self.bulk_order, newer_bulk_order, self.bulk_order, newer_bulk_order):
+            OrderEntry.objects.create(
+                bulk_order=bulk_order,
+                email="customer@example.com",
+                full_name="Customer",
+                size="M"
+            )
+
+        orders = OrderEntry.objects.filter(email="customer@example.com")
+        self.assertEqual(
+            [(order.bulk_order_id, order.serial_number) for order in orders],
+            [
+                (newer_bulk_order.id, 1),
+                (newer_bulk_order.id, 2),
+                (self.bulk_order.id, 1),
+                (self.bulk_order.id, 2),
+            ]
+        )
+
     def test_unique_together_constraint(self):
         """Test that (bulk_order, serial_number) must be unique"""
         order_1 = OrderEntry.objects.create(
@@ -622,7 +622,7 @@ class PaymentWebhookTest(TransactionTestCase):
 
     @patch('bulk_orders.views.verify_payment')
     @patch('bulk_orders.views.send_payment_receipt_email')
-    @patch('bulk_orders.views.generate_payment_receipt_pdf_task')
+    @patch('bulk_orders.views.generate_order_entry_receipt_pdf_task')
     def test_webhook_success(self, mock_pdf_task, mock_email, mock_verify):
         """Test successful webhook processing"""
         # Mock Paystack verification
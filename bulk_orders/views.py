@@ -23,7 +23,7 @@ from .utils import (
     generate_bulk_order_word,
     generate_bulk_order_excel,
 )
-from jmw.background_utils import send_payment_receipt_email, generate_payment_receipt_pdf_task
+from jmw.background_utils import send_payment_receipt_email, generate_order_entry_receipt_pdf_task
 import logging
 
 logger = logging.getLogger(__name__)
@@ -334,7 +334,7 @@ class OrderEntryViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         if self.request.user.is_authenticated:
-            return OrderEntry.objects.filter(email=self.request.user.email).select_related('bulk_order', 'coupon_used')
+            return OrderEntry.objects.filter(email=self.request.user.email).select_related('bulk_order')
         return OrderEntry.objects.none()
 
     # ✅ Payment initialization endpoint
@@ -423,7 +423,10 @@ def bulk_order_payment_webhook(request):
         return JsonResponse({'status': 'error', 'message': 'Invalid method'}, status=405)
 
     try:
-        payload = json.loads(request.body)
+        # Reuse the payload already decoded by the webhook router, if any
+        payload = getattr(request, 'webhook_payload', None)
+        if payload is None:
+            payload = json.loads(request.body)
         logger.info(f"Bulk order payment webhook received: {payload}")
 
         # Only handle successful charges
@@ -492,7 +495,7 @@ def bulk_order_payment_webhook(request):
             send_payment_receipt_email(order_entry)
 
             # ✅ GENERATE PDF RECEIPT (ASYNC / BACKGROUND)
-            generate_payment_receipt_pdf_task(str(order_entry_id))
+            generate_order_entry_receipt_pdf_task(str(order_entry_id))
 
             return JsonResponse({
                 'status': 'success',
@@ -3,8 +3,44 @@ import json
 import os
 from datetime import datetime
 from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
 from pathlib import Path
 
+ACTIVE_IMAGES_CACHE_KEY = "feed_active_images_v2"
+ACTIVE_IMAGES_CACHE_TIMEOUT = 300
+
+
+def _load_active_images():
+    from .models import Image
+    from .serializers import ImageSerializer
+
+    # Plain dicts rather than model instances, so a hit skips serialization
+    # and cached entries don't depend on the model's pickled state
+    images = Image.objects.filter(active=True)
+    return [dict(row) for row in ImageSerializer(images, many=True).data]
+
+
+def get_active_images():
+    """Serialized active feed images, newest first, cached until an image changes"""
+    return cache.get_or_set(
+        ACTIVE_IMAGES_CACHE_KEY, _load_active_images, ACTIVE_IMAGES_CACHE_TIMEOUT
+    )
+
+
+def warm_active_images_cache():
+    cache.set(ACTIVE_IMAGES_CACHE_KEY, _load_active_images(), ACTIVE_IMAGES_CACHE_TIMEOUT)
+
+
+def clear_active_images_cache():
+    """
+    Drop the cached image list and rebuild it once the change is committed,
+    so readers after an edit don't each pay for the query. The timeout is
+    kept as a backstop for bulk admin actions, which skip Image.save/delete.
+    """
+    cache.delete(ACTIVE_IMAGES_CACHE_KEY)
+    transaction.on_commit(warm_active_images_cache)
+
 
 class VideoCache:
     def __init__(self):
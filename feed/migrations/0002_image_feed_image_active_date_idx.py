@@ -0,0 +1,17 @@
+# Generated by Django 5.1.3 on 2026-10-16 17:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feed', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='image',
+            index=models.Index(condition=models.Q(('active', True)), fields=['-upload_date'], name='feed_image_active_date_idx'),
+        ),
+    ]
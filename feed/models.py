@@ -2,6 +2,7 @@ from django.db import models
 from django.utils import timezone
 from cloudinary_storage.storage import MediaCloudinaryStorage
 import uuid
+from .cache_utils import clear_active_images_cache
 
 
 class Image(models.Model):
@@ -17,10 +18,26 @@ class Image(models.Model):
 
     class Meta:
         ordering = ["-upload_date"]
+        indexes = [
+            models.Index(
+                fields=['-upload_date'],
+                name='feed_image_active_date_idx',
+                condition=models.Q(active=True),
+            ),
+        ]
 
     def __str__(self):
         return f"Image {self.id} - {self.upload_date}"
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        clear_active_images_cache()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        clear_active_images_cache()
+        return result
+
     def get_optimized_url(self):
         """
         Returns optimized Cloudinary URL with transformations.
@@ -1,3 +1,66 @@
 from django.test import TestCase
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+from rest_framework import status
 
-# Create your tests here.
+from .models import Image
+from .cache_utils import get_active_images
+
+
+class ActiveImagesCacheTest(TestCase):
+    """Test cases for the cached active image list."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        self.image = Image.objects.create(url="feed_images/one.jpg")
+
+    def test_active_images_are_cached(self):
+        """Test that the active image list is only queried and serialized once."""
+        get_active_images()
+        with self.assertNumQueries(1):
+            # One cache read from the database cache backend, no image query
+            images = get_active_images()
+        self.assertEqual([image['id'] for image in images], [str(self.image.id)])
+
+    def test_cache_cleared_when_image_changes(self):
+        """Test that saving or deleting an image refreshes the list."""
+        get_active_images()
+
+        self.image.active = False
+        self.image.save()
+        self.assertEqual(get_active_images(), [])
+
+        other = Image.objects.create(url="feed_images/two.jpg")
+        self.assertEqual([image['id'] for image in get_active_images()], [str(other.id)])
+
+        other.delete()
+        self.assertEqual(get_active_images(), [])
+
+    def test_cache_warmed_after_commit(self):
+        """Test that the list is rebuilt once an image change is committed."""
+        with self.captureOnCommitCallbacks(execute=True):
+            other = Image.objects.create(url="feed_images/two.jpg")
+
+        with self.assertNumQueries(1):
+            images = get_active_images()
+        self.assertEqual({image['id'] for image in images}, {str(self.image.id), str(other.id)})
+
+
+class ImageAPITest(APITestCase):
+    """Test cases for the image API."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        Image.objects.create(url="feed_images/active.jpg")
+        Image.objects.create(url="feed_images/hidden.jpg", active=False)
+
+    def test_image_list_returns_active_images(self):
+        """Test that the public list only contains active images."""
+        response = self.client.get('/api/feed/images/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data.get('results', response.data)
+        self.assertEqual(len(results), 1)
+        self.assertTrue(results[0]['active'])
@@ -1,6 +1,7 @@
 from rest_framework import viewsets, permissions, views, response, status
 from .models import Image
 from .serializers import ImageSerializer
+from .cache_utils import get_active_images
 from .youtube_service import YouTubeService
 
 class ImageViewSet(viewsets.ModelViewSet):
@@ -13,6 +14,14 @@ class ImageViewSet(viewsets.ModelViewSet):
             return Image.objects.all()
         return Image.objects.filter(active=True)
 
+    def list(self, request, *args, **kwargs):
+        # The public feed is served from cache; staff and custom orderings
+        # go through the regular queryset
+        if request.user.is_staff or "ordering" in request.query_params:
+            return super().list(request, *args, **kwargs)
+        page = self.paginate_queryset(get_active_images())
+        return self.get_paginated_response(page)
+
 class YouTubeVideoView(views.APIView):
     permission_classes = [permissions.AllowAny]
 
@@ -3,20 +3,94 @@
 Centralized background task and email utilities
 Replaces Celery with lightweight threading and django-background-tasks
 """
-from threading import Thread
+import os
+import tempfile
+from functools import lru_cache
+from queue import Empty, SimpleQueue
+from smtplib import SMTPServerDisconnected
+from threading import Thread, local
 from background_task import background
-from django.core.mail import EmailMessage
+from django.core.mail import EmailMessage, EmailMultiAlternatives, get_connection
 from django.conf import settings
-from django.template.loader import render_to_string
+from django.core.cache import cache
+from django.template.loader import get_template, render_to_string
 import logging
 
 logger = logging.getLogger(__name__)
 
+def order_items_with_products(lookup='items'):
+    """
+    Prefetch for an order's items together with their generic products.
+
+    One query per product type, so templates can use item.product freely.
+    """
+    from django.contrib.contenttypes.prefetch import GenericPrefetch
+    from django.db.models import Prefetch
+    from order.models import OrderItem
+    from products.models import NyscKit, NyscTour, Church
+
+    return Prefetch(
+        lookup,
+        queryset=OrderItem.objects.select_related('content_type').prefetch_related(
+            GenericPrefetch('product', [NyscKit.objects.all(), NyscTour.objects.all(), Church.objects.all()])
+        ),
+    )
+
 
 # ============================================================================
 # EMAIL UTILITIES (Using Threading for Quick Async)
 # ============================================================================
 
+# Open mail connections are kept in a pool shared by every send in this
+# process, so emails sent close together (e.g. reports for several states)
+# reuse an SMTP session instead of paying for a new connection and TLS
+# handshake each time. An SMTP connection can only carry one send at a time,
+# so concurrent sends each take their own connection from the pool.
+_idle_mail_connections = SimpleQueue()
+
+
+def _close_mail_connection(connection):
+    try:
+        connection.close()
+    except Exception:
+        pass
+
+
+def send_with_shared_connection(email):
+    """
+    Send an EmailMessage over a pooled mail connection.
+
+    A connection is opened when none is idle and returned to the pool after
+    a successful send. If the server has dropped it (e.g. after sitting
+    idle) it is reopened and the send retried once. Any other error is
+    raised without a retry, so a message that may already have been
+    delivered is not sent twice.
+    """
+    try:
+        connection = _idle_mail_connections.get_nowait()
+    except Empty:
+        connection = None
+
+    for attempt in range(2):
+        if connection is None:
+            connection = get_connection()
+            connection.open()
+        email.connection = connection
+        try:
+            sent = email.send()
+        except (SMTPServerDisconnected, ConnectionError):
+            _close_mail_connection(connection)
+            connection = None
+            if attempt:
+                raise
+        except Exception:
+            _close_mail_connection(connection)
+            raise
+        else:
+            _idle_mail_connections.put(connection)
+            return sent
+
+
 def send_email_async(subject, message, from_email, recipient_list, attachments=None, html_message=None):
     """
     Send email asynchronously using threading.
@@ -32,17 +106,15 @@ def send_email_async(subject, message, from_email, recipient_list, attachments=N
     """
     def _send():
         try:
+            email = EmailMultiAlternatives(subject, message, from_email, recipient_list)
             if html_message:
-                email = EmailMessage(subject, html_message, from_email, recipient_list)
-                email.content_subtype = "html"
-            else:
-                email = EmailMessage(subject, message, from_email, recipient_list)
+                email.attach_alternative(html_message, "text/html")
             
             if attachments:
                 for filename, content, mimetype in attachments:
                     email.attach(filename, content, mimetype)
             
-            email.send()
+            send_with_shared_connection(email)
             logger.info(f"Email sent successfully: {subject} to {recipient_list}")
         except Exception as e:
             logger.error(f"Error sending email '{subject}' to {recipient_list}: {str(e)}")
@@ -166,8 +238,8 @@ def generate_bulk_order_pdf_task(bulk_order_id, recipient_email):
 
 
 @background(schedule=0)
-def generate_payment_receipt_pdf_task(order_entry_id):
-    """Generate individual payment receipt PDF in background"""
+def generate_order_entry_receipt_pdf_task(order_entry_id):
+    """Generate individual bulk order entry receipt PDF in background"""
     try:
         from bulk_orders.models import OrderEntry
         from weasyprint import HTML
@@ -225,7 +297,9 @@ def send_order_confirmation_email_async(order_id):
         try:
             from order.models import Order
 
-            order = Order.objects.select_related('user').prefetch_related('items').get(id=order_id)
+            order = Order.objects.prefetch_related(
+                order_items_with_products()
+            ).get(id=order_id)
 
             context = {
                 'order': order,
@@ -243,7 +317,7 @@ def send_order_confirmation_email_async(order_id):
 
             email = EmailMessage(subject, html_message, settings.DEFAULT_FROM_EMAIL, [order.email])
             email.content_subtype = "html"
-            email.send()
+            send_with_shared_connection(email)
 
             logger.info(f"Order confirmation email sent for order: {order.reference}")
 
@@ -270,9 +344,8 @@ def generate_order_confirmation_pdf_task(order_id):
         from weasyprint import HTML
         from django.utils import timezone
 
-        order = Order.objects.select_related('user').prefetch_related(
-            'items__content_type',
-            'items__content_object'
+        order = Order.objects.prefetch_related(
+            order_items_with_products()
         ).get(id=order_id)
 
         context = {
@@ -325,7 +398,9 @@ def send_payment_receipt_email_async(payment_id):
         try:
             from payment.models import PaymentTransaction
 
-            payment = PaymentTransaction.objects.select_related('order').get(id=payment_id)
+            payment = PaymentTransaction.objects.select_related('order').prefetch_related(
+                order_items_with_products('order__items')
+            ).get(id=payment_id)
 
             context = {
                 'payment': payment,
@@ -344,7 +419,7 @@ def send_payment_receipt_email_async(payment_id):
 
             email = EmailMessage(subject, html_message, settings.DEFAULT_FROM_EMAIL, [payment.email])
             email.content_subtype = "html"
-            email.send()
+            send_with_shared_connection(email)
 
             logger.info(f"Payment receipt email sent for payment: {payment.reference}")
 
@@ -357,6 +432,38 @@ def send_payment_receipt_email_async(payment_id):
     logger.info(f"Payment receipt email queued for payment_id: {payment_id}")
 
 
+# Rendered receipts are kept for a day so a retried or resent receipt
+# skips rendering
+RECEIPT_PDF_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Background tasks run on several threads, so each keeps its own WeasyPrint
+# font configuration rather than sharing one across threads
+_pdf_local = local()
+
+
+@lru_cache(maxsize=None)
+def _payment_receipt_template():
+    """Compiled payment receipt template, parsed once per process"""
+    return get_template('order/payment_receipt_pdf.html')
+
+
+def _font_config():
+    """This thread's WeasyPrint font configuration, so fonts are loaded once per thread"""
+    font_config = getattr(_pdf_local, 'font_config', None)
+    if font_config is None:
+        from weasyprint.fonts import FontConfiguration
+        font_config = _pdf_local.font_config = FontConfiguration()
+    return font_config
+
+
+def _render_payment_receipt_pdf(context, target):
+    """Render the payment receipt into ``target`` (a path or file object)"""
+    from weasyprint import HTML
+
+    html_string = _payment_receipt_template().render(context)
+    HTML(string=html_string).write_pdf(target=target, font_config=_font_config())
+
+
 @background(schedule=0)
 def generate_payment_receipt_pdf_task(payment_id):
     """
@@ -368,12 +475,12 @@ def generate_payment_receipt_pdf_task(payment_id):
     """
     try:
         from payment.models import PaymentTransaction
-        from weasyprint import HTML
         from django.utils import timezone
 
+        # Items and their generic products are loaded up front so the
+        # template's item loop runs without per-row queries
         payment = PaymentTransaction.objects.select_related('order').prefetch_related(
-            'order__items__content_type',
-            'order__items__content_object'
+            order_items_with_products('order__items')
         ).get(id=payment_id)
 
         context = {
@@ -388,10 +495,6 @@ def generate_payment_receipt_pdf_task(payment_id):
             'generated_date': timezone.now(),
         }
 
-        html_string = render_to_string('order/payment_receipt_pdf.html', context)
-        html = HTML(string=html_string)
-        pdf = html.write_pdf()
-
         filename = settings.PDF_FILENAME_PAYMENT_RECEIPT.format(
             company=settings.COMPANY_SHORT_NAME,
             reference=payment.reference
@@ -400,14 +503,27 @@ def generate_payment_receipt_pdf_task(payment_id):
         # Send email with PDF attachment
         subject = settings.PAYMENT_RECEIPT_SUBJECT.format(reference=payment.reference)
         message = f"Payment received! Your receipt is attached."
-
-        send_email_async(
-            subject=subject,
-            message=message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[payment.email],
-            attachments=[(filename, pdf, 'application/pdf')]
-        )
+        email = EmailMessage(subject, message, settings.DEFAULT_FROM_EMAIL, [payment.email])
+
+        # A receipt already rendered for this payment (a retried task or a
+        # resend) is attached from the cache without laying it out again.
+        # Otherwise WeasyPrint writes the PDF straight to a temporary file
+        # that is attached from disk; the email is sent on this thread
+        # because the file is removed when the block exits.
+        cache_key = f"receipt_pdf:{payment.reference}"
+        pdf = cache.get(cache_key)
+        if pdf is not None:
+            email.attach(filename, pdf, 'application/pdf')
+            send_with_shared_connection(email)
+        else:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                pdf_path = os.path.join(tmp_dir, filename)
+                _render_payment_receipt_pdf(context, pdf_path)
+                with open(pdf_path, 'rb') as pdf_file:
+                    cache.set(cache_key, pdf_file.read(), RECEIPT_PDF_CACHE_TIMEOUT)
+
+                email.attach_file(pdf_path, 'application/pdf')
+                send_with_shared_connection(email)
 
         logger.info(f"Payment receipt PDF generated and sent for payment: {payment.reference}")
 
@@ -430,9 +546,8 @@ def generate_admin_order_report_pdf_task(order_id, recipient_email):
         from weasyprint import HTML
         from django.utils import timezone
 
-        order = Order.objects.select_related('user').prefetch_related(
-            'items__content_type',
-            'items__content_object'
+        order = Order.objects.prefetch_related(
+            order_items_with_products()
         ).get(id=order_id)
 
         context = {
@@ -126,7 +126,6 @@ TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
         "DIRS": [],  # No custom template directories needed
-        "APP_DIRS": True,  # Keep for admin templates and app-specific templates
         "OPTIONS": {
             "context_processors": [
                 "django.template.context_processors.debug",
@@ -134,6 +133,17 @@ TEMPLATES = [
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
             ],
+            # Keep parsed templates in memory (PDF/email renders in background workers)
+            # App directories are still searched for admin and app-specific templates
+            "loaders": [
+                (
+                    "django.template.loaders.cached.Loader",
+                    [
+                        "django.template.loaders.filesystem.Loader",
+                        "django.template.loaders.app_directories.Loader",
+                    ],
+                ),
+            ],
         },
     },
 ]
@@ -211,6 +221,11 @@ else:
     REST_FRAMEWORK_CONFIG['DEFAULT_AUTHENTICATION_CLASSES'] = [
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ]
+    # JSON only in production; the browsable API renders a full HTML page
+    # with forms for any request that accepts text/html
+    REST_FRAMEWORK_CONFIG['DEFAULT_RENDERER_CLASSES'] = [
+        'rest_framework.renderers.JSONRenderer',
+    ]
 
 REST_FRAMEWORK = REST_FRAMEWORK_CONFIG
 
@@ -388,6 +403,8 @@ else:
     EMAIL_USE_TLS = True
     EMAIL_HOST_USER = "ifeanyinnamani@jumemegawears.com"
     EMAIL_HOST_PASSWORD = env("EMAIL_HOST_PASSWORD")
+    # Don't let a stalled SMTP server hang the worker threads sending mail
+    EMAIL_TIMEOUT = env.int("EMAIL_TIMEOUT", default=30)
 
 DEFAULT_FROM_EMAIL = "JMW <info@jumemegawears.com>"
 CONTACT_EMAIL = "contact@jumemegawears.com"
@@ -402,6 +419,13 @@ SERVER_EMAIL = "server@jumemegawears.com"
 BACKGROUND_TASK_RUN_ASYNC = True
 BACKGROUND_TASK_ASYNC_THREADS = 4
 
+# PDF engine for the NYSC Kit/Tour/Church reports: "weasyprint" or "chromium"
+# ("chromium" needs Playwright with its Chromium build installed on the worker)
+REPORT_PDF_BACKEND = env.str("REPORT_PDF_BACKEND", default="weasyprint")
+
+# Reports are emailed as signed Cloudinary links valid for this many seconds
+REPORT_DOWNLOAD_LINK_EXPIRY = env.int("REPORT_DOWNLOAD_LINK_EXPIRY", default=60 * 60 * 24 * 7)
+
 # ==============================================================================
 # CACHING
 # ==============================================================================
@@ -7,7 +7,25 @@ class MeasurementSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Measurement
-        fields = "__all__"
+        fields = (
+            "user",
+            "id",
+            "created_at",
+            "updated_at",
+            "is_deleted",
+            "chest",
+            "shoulder",
+            "neck",
+            "sleeve_length",
+            "sleeve_round",
+            "top_length",
+            "waist",
+            "thigh",
+            "knee",
+            "ankle",
+            "hips",
+            "trouser_length",
+        )
         read_only_fields = ("user", "created_at", "updated_at", "is_deleted")
         extra_kwargs = {
             "chest": {
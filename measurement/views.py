@@ -56,7 +56,6 @@ class MeasurementViewSet(viewsets.ModelViewSet):
     ordering = ["-created_at"]
 
     def get_queryset(self):
-        """Return only the authenticated user's measurements with optimized query."""
-        return Measurement.objects.filter(user=self.request.user).select_related(
-            "user"
-        )
+        """Return only the authenticated user's measurements."""
+        # The serializer only reads user_id, so the user row isn't joined
+        return Measurement.objects.filter(user=self.request.user)
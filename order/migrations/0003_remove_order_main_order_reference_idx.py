@@ -0,0 +1,17 @@
+# Generated by Django 5.1.3 on 2026-10-16 15:38
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('order', '0002_order_address_order_city_order_reference_order_state_and_more'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='order',
+            name='main_order_reference_idx',
+        ),
+    ]
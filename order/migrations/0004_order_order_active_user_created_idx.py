@@ -0,0 +1,19 @@
+# Generated by Django 5.1.3 on 2026-10-16 15:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('order', '0003_remove_order_main_order_reference_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(condition=models.Q(('status__in', ['pending', 'paid', 'shipped', 'delivered'])), fields=['user', '-created'], name='order_active_user_created_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.3 on 2026-10-16 17:40
+
+import django.db.models.fields.json
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('order', '0004_order_order_active_user_created_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(django.db.models.fields.json.KeyTransform('state', 'delivery_details'), condition=models.Q(('paid', True)), name='order_delivery_state_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(django.db.models.fields.json.KeyTransform('local_government', 'delivery_details'), name='order_delivery_lga_idx'),
+        ),
+    ]
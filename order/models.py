@@ -1,7 +1,10 @@
 import uuid
+from decimal import Decimal
 from django.db import models
+from django.db.models import Sum, F, Q, DecimalField
 from django.core.validators import RegexValidator, MinValueValidator
 from django.core.exceptions import ValidationError
+from django.db.models.fields.json import KeyTransform
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.conf import settings
@@ -58,10 +61,27 @@ class Order(models.Model):
         ordering = ["-created"]
         indexes = [
             models.Index(fields=['user', '-created'], name='main_order_user_created_idx'),
-            models.Index(fields=['reference'], name='main_order_reference_idx'),
             models.Index(fields=['email'], name='main_order_email_idx'),
             models.Index(fields=['status', 'paid'], name='main_order_status_paid_idx'),
             models.Index(fields=['-created'], name='main_order_created_idx'),
+            # Partial index for a customer's non-cancelled orders, newest first
+            models.Index(
+                fields=['user', '-created'],
+                condition=Q(status__in=['pending', 'paid', 'shipped', 'delivered']),
+                name='order_active_user_created_idx',
+            ),
+            # State filter and LGA ordering for the NYSC Kit report. These
+            # index delivery_details -> 'key', the expression the ORM's
+            # delivery_details__<key> lookups and ordering compile to.
+            models.Index(
+                KeyTransform('state', 'delivery_details'),
+                condition=Q(paid=True),
+                name='order_delivery_state_idx',
+            ),
+            models.Index(
+                KeyTransform('local_government', 'delivery_details'),
+                name='order_delivery_lga_idx',
+            ),
         ]
 
     def save(self, *args, **kwargs):
@@ -73,7 +93,7 @@ class Order(models.Model):
             random_part = ''.join(random.choices(string.digits, k=6))
             self.reference = f"{prefix}-ORD-{random_part}"
 
-            # Ensure uniqueness
+            # Ensure uniqueness (SELECT 1 probe served by the unique index on reference)
             while Order.objects.filter(reference=self.reference).exists():
                 random_part = ''.join(random.choices(string.digits, k=6))
                 self.reference = f"{prefix}-ORD-{random_part}"
@@ -84,7 +104,14 @@ class Order(models.Model):
         return f"Order {self.reference}"
 
     def get_total_cost(self):
-        return sum(item.get_cost() for item in self.items.all())
+        """Sum of price * quantity across items, computed in the database"""
+        total = self.items.aggregate(
+            total=Sum(
+                F('price') * F('quantity'),
+                output_field=DecimalField(max_digits=12, decimal_places=2)
+            )
+        )['total']
+        return total or Decimal('0')
 
 class OrderItem(models.Model):
     order = models.ForeignKey(Order, related_name="items", on_delete=models.CASCADE)
@@ -108,6 +135,33 @@ class OrderItem(models.Model):
             models.Index(fields=['content_type', 'object_id'], name='orderitem_product_idx'),
         ]
 
+    def save(self, *args, **kwargs):
+        """Keep the parent order's denormalized total_cost in step with this item"""
+        previous = None
+        if not self._state.adding:
+            previous = OrderItem.objects.filter(pk=self.pk).only('order', 'price', 'quantity').first()
+        super().save(*args, **kwargs)
+        if previous is not None and previous.order_id != self.order_id:
+            # Moved to another order: the old order loses the item's previous
+            # cost and the new one gains its full cost
+            self._adjust_order_total(previous.order_id, -previous.get_cost())
+            self._adjust_order_total(self.order_id, self.get_cost())
+        else:
+            previous_cost = previous.get_cost() if previous else 0
+            self._adjust_order_total(self.order_id, self.get_cost() - previous_cost)
+
+    def delete(self, *args, **kwargs):
+        cost = self.get_cost()
+        order_id = self.order_id
+        result = super().delete(*args, **kwargs)
+        self._adjust_order_total(order_id, -cost)
+        return result
+
+    @staticmethod
+    def _adjust_order_total(order_id, delta):
+        if delta:
+            Order.objects.filter(pk=order_id).update(total_cost=F('total_cost') + delta)
+
     def get_cost(self):
         """Calculate cost, handling None price gracefully for admin add view"""
         if self.price is None:
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from django.db import transaction
+from django.contrib.contenttypes.models import ContentType
 from .models import Order, OrderItem
 from cart.models import Cart
 from products.models import NyscKit, NyscTour, Church
@@ -9,6 +10,21 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# content_type_id -> product serializer, filled on first use
+_PRODUCT_SERIALIZERS = {}
+
+
+def get_product_serializer_class(content_type_id):
+    """Return the serializer class for a product content type, or None"""
+    if not _PRODUCT_SERIALIZERS:
+        for model, serializer_class in (
+            (NyscKit, NyscKitSerializer),
+            (NyscTour, NyscTourSerializer),
+            (Church, ChurchSerializer),
+        ):
+            _PRODUCT_SERIALIZERS[ContentType.objects.get_for_model(model).id] = serializer_class
+    return _PRODUCT_SERIALIZERS.get(content_type_id)
+
 
 class OrderItemSerializer(serializers.ModelSerializer):
     product = serializers.SerializerMethodField()
@@ -19,13 +35,23 @@ class OrderItemSerializer(serializers.ModelSerializer):
 
     def get_product(self, obj):
         item = obj.product
-        if isinstance(item, NyscKit):
-            return NyscKitSerializer(item).data
-        elif isinstance(item, NyscTour):
-            return NyscTourSerializer(item).data
-        elif isinstance(item, Church):
-            return ChurchSerializer(item).data
-        return str(item)
+        serializer_class = get_product_serializer_class(obj.content_type_id)
+        if serializer_class is None or item is None:
+            return str(item)
+        return serializer_class(item).data
+
+
+class OrderListSerializer(serializers.ModelSerializer):
+    """Order representation for list views (no address or delivery details)"""
+    items = OrderItemSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Order
+        fields = [
+            'id', 'reference', 'user', 'first_name', 'last_name', 'email', 'phone_number',
+            'created', 'updated', 'paid', 'total_cost', 'status', 'items'
+        ]
+        read_only_fields = fields
 
 
 class OrderSerializer(serializers.ModelSerializer):
@@ -60,19 +86,22 @@ class OrderSerializer(serializers.ModelSerializer):
             except Cart.DoesNotExist:
                 raise serializers.ValidationError("User has no cart")
 
-        if not cart or not cart.items.exists():
+        # Materialize cart items once; reused for the total and the item copy
+        cart_items = list(cart.items.select_related('content_type')) if cart else []
+        if not cart_items:
             raise serializers.ValidationError("Cart is empty")
 
         # Create Order (reference will be auto-generated)
         order = Order.objects.create(
             user=user,  # ✅ Now using the popped user value
-            total_cost=cart.total_price,
+            total_cost=sum(item.total_price for item in cart_items),
             **validated_data
         )
 
-        # Move items from cart to order
-        for item in cart.items.all():
-            OrderItem.objects.create(
+        # Move items from cart to order. bulk_create skips OrderItem.save, so the
+        # total_cost set above stays authoritative without per-item updates.
+        OrderItem.objects.bulk_create([
+            OrderItem(
                 order=order,
                 content_type=item.content_type,
                 object_id=item.object_id,
@@ -80,6 +109,8 @@ class OrderSerializer(serializers.ModelSerializer):
                 quantity=item.quantity,
                 extra_fields=item.extra_fields
             )
+            for item in cart_items
+        ])
 
         # Clear Cart (keep cart object, just clear items)
         cart.items.all().delete()
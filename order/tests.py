@@ -229,6 +229,54 @@ class OrderItemModelTest(TestCase):
         )
         self.assertEqual(item.get_cost(), 0)
 
+    def test_total_cost_tracks_item_changes(self):
+        """Test that saving and deleting items keeps order.total_cost in sync."""
+        item = OrderItem.objects.create(
+            order=self.order,
+            content_type=self.content_type,
+            object_id=self.product.id,
+            price=Decimal("1000.00"),
+            quantity=2
+        )
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.total_cost, Decimal("7000.00"))
+
+        item.quantity = 3
+        item.save()
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.total_cost, Decimal("8000.00"))
+
+        item.delete()
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.total_cost, Decimal("5000.00"))
+
+    def test_total_cost_follows_item_moved_to_another_order(self):
+        """Test that moving an item takes its cost off the old order and adds it to the new one."""
+        item = OrderItem.objects.create(
+            order=self.order,
+            content_type=self.content_type,
+            object_id=self.product.id,
+            price=Decimal("1000.00"),
+            quantity=2
+        )
+        other_order = Order.objects.create(
+            user=self.user,
+            first_name="Jane",
+            last_name="Doe",
+            email="jane@example.com",
+            phone_number="08087654321",
+            total_cost=Decimal("3000.00")
+        )
+
+        item.order = other_order
+        item.quantity = 3
+        item.save()
+
+        self.order.refresh_from_db()
+        other_order.refresh_from_db()
+        self.assertEqual(self.order.total_cost, Decimal("5000.00"))
+        self.assertEqual(other_order.total_cost, Decimal("6000.00"))
+
     def test_order_item_string_representation(self):
         """Test the string representation of an order item."""
         item = OrderItem.objects.create(
@@ -381,3 +429,25 @@ class OrderAPITest(APITestCase):
         order_ids = [order['id'] for order in response.data.get('results', response.data)]
         self.assertIn(str(order1.id), order_ids)
         self.assertNotIn(str(order2.id), order_ids)
+
+    def test_order_list_omits_delivery_fields(self):
+        """Test that the list endpoint leaves out address and delivery details."""
+        Order.objects.create(
+            user=self.user,
+            first_name="John",
+            last_name="Doe",
+            email="john@example.com",
+            phone_number="08012345678",
+            address="123 Test St",
+            delivery_details={"state": "Lagos"},
+            total_cost=Decimal("5000.00")
+        )
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get('/api/order/orders/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        order_data = response.data.get('results', response.data)[0]
+        self.assertIn('reference', order_data)
+        self.assertNotIn('delivery_details', order_data)
+        self.assertNotIn('address', order_data)
@@ -2,6 +2,7 @@
 from django.template.loader import render_to_string
 from django.core.mail import EmailMessage
 from django.conf import settings
+from jmw.background_utils import send_with_shared_connection
 import logging
 
 logger = logging.getLogger(__name__)
@@ -55,10 +56,10 @@ Best regards,
 
         email_msg = EmailMessage(subject, message, settings.DEFAULT_FROM_EMAIL, [email])
         email_msg.attach(f"JMW_Receipt_{reference}.pdf", pdf_content, "application/pdf")
-        email_msg.send()
+        send_with_shared_connection(email_msg)
         
         logger.info(f"Receipt email sent successfully for reference {reference}")
 
     except Exception as e:
         logger.error(f"Error sending receipt email: {str(e)}")
-        raise
\ No newline at end of file
+        raise
@@ -1,7 +1,10 @@
+from django.contrib.contenttypes.prefetch import GenericPrefetch
+from django.db.models import Prefetch
 from rest_framework import viewsets, permissions
 from rest_framework.decorators import action
-from .models import Order
-from .serializers import OrderSerializer
+from products.models import NyscKit, NyscTour, Church
+from .models import Order, OrderItem
+from .serializers import OrderSerializer, OrderListSerializer
 
 
 class OrderViewSet(viewsets.ModelViewSet):
@@ -13,7 +16,27 @@ class OrderViewSet(viewsets.ModelViewSet):
         # ✅ Only return orders for authenticated users
         if not self.request.user.is_authenticated:
             return Order.objects.none()
-        return Order.objects.filter(user=self.request.user).prefetch_related('items', 'items__product')
+        # Products are serialized with their category, so load it alongside
+        # them instead of once per item
+        items = OrderItem.objects.prefetch_related(
+            GenericPrefetch('product', [
+                NyscKit.objects.select_related('category'),
+                NyscTour.objects.select_related('category'),
+                Church.objects.select_related('category'),
+            ])
+        )
+        queryset = Order.objects.filter(user=self.request.user).prefetch_related(
+            Prefetch('items', queryset=items)
+        )
+        if self.action == 'list':
+            # List responses don't render these columns; skip transferring them
+            queryset = queryset.defer('delivery_details', 'address', 'city', 'state')
+        return queryset
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return OrderListSerializer
+        return OrderSerializer
 
     def get_permissions(self):
         """
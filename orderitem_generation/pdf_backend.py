@@ -0,0 +1,116 @@
+"""
+PDF rendering for the NYSC Kit / NYSC Tour / Church order reports.
+
+The reports are long LGA-grouped tables, which WeasyPrint lays out slowly.
+When REPORT_PDF_BACKEND is "chromium" they are printed by a headless
+Chromium (Playwright) kept alive per worker thread; otherwise, or if
+Playwright is not installed, WeasyPrint is used.
+
+WeasyPrint reuses one font configuration per worker thread instead of
+building a new one for every report.
+
+The PDF is written into a spooled temporary file that moves to disk once
+it passes SPOOL_MAX_SIZE, so a 100+ page report is not held in memory.
+
+A report can be passed as several HTML sections built from the same
+template. WeasyPrint lays each section out as its own document and joins
+the pages, which keeps very long tables from being laid out in one go;
+Chromium appends the sections to a single page.
+"""
+import tempfile
+import threading
+from django.conf import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Imported once when the worker starts rather than on its first report.
+# WeasyPrint needs the Pango/Cairo system libraries, so a machine without
+# them (e.g. Windows without GTK) can still start and use Chromium.
+try:
+    from weasyprint import HTML
+    from weasyprint.fonts import FontConfiguration
+except (ImportError, OSError) as e:
+    logger.warning(f"WeasyPrint not available: {str(e)}")
+    HTML = FontConfiguration = None
+
+# Playwright's sync API is bound to the thread that started it, and
+# background tasks run on several threads, so each thread keeps its own
+# browser (and WeasyPrint font configuration).
+_local = threading.local()
+
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+
+def _chromium_browser():
+    """Return this thread's Chromium instance, launching it on first use"""
+    browser = getattr(_local, "browser", None)
+    if browser is None or not browser.is_connected():
+        if getattr(_local, "playwright", None) is None:
+            from playwright.sync_api import sync_playwright
+            _local.playwright = sync_playwright().start()
+        browser = _local.playwright.chromium.launch()
+        _local.browser = browser
+    return browser
+
+
+_APPEND_SECTION_JS = """html => {
+    const section = new DOMParser().parseFromString(html, "text/html");
+    document.body.append(...section.body.childNodes);
+}"""
+
+
+def _render_with_chromium(html_strings, target):
+    context = _chromium_browser().new_context()
+    try:
+        page = context.new_page()
+        page.set_content(html_strings[0], wait_until="domcontentloaded")
+        for html_string in html_strings[1:]:
+            page.evaluate(_APPEND_SECTION_JS, html_string)
+        target.write(page.pdf(format="A4", print_background=True))
+    finally:
+        context.close()
+
+
+def _font_config():
+    """Return this thread's WeasyPrint font configuration, created on first use"""
+    font_config = getattr(_local, "font_config", None)
+    if font_config is None:
+        font_config = _local.font_config = FontConfiguration()
+    return font_config
+
+
+def _render_with_weasyprint(html_strings, target):
+    if HTML is None:
+        raise ImportError("WeasyPrint is not available. Install GTK+ libraries for PDF generation.")
+    documents = [
+        HTML(string=html_string).render(font_config=_font_config())
+        for html_string in html_strings
+    ]
+    pages = [page for document in documents for page in document.pages]
+    documents[0].copy(pages).write_pdf(target=target)
+
+
+def render_pdf(*html_strings):
+    """
+    Render report HTML to PDF with the configured backend.
+
+    Several HTML strings are treated as consecutive sections of one report.
+    Returns a spooled temporary file positioned at the start of the PDF;
+    the caller is responsible for closing it.
+    """
+    pdf_file = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    try:
+        if getattr(settings, "REPORT_PDF_BACKEND", "weasyprint") == "chromium":
+            try:
+                _render_with_chromium(html_strings, pdf_file)
+            except ImportError:
+                logger.warning("Playwright is not installed; rendering report PDF with WeasyPrint")
+                _render_with_weasyprint(html_strings, pdf_file)
+        else:
+            _render_with_weasyprint(html_strings, pdf_file)
+    except Exception:
+        pdf_file.close()
+        raise
+    pdf_file.seek(0)
+    return pdf_file
@@ -1,3 +1,67 @@
 from django.test import TestCase
+from django.contrib.contenttypes.models import ContentType
+from decimal import Decimal
+from unittest.mock import patch
 
-# Create your tests here.
+from order.models import Order, OrderItem
+from products.models import Category, Church
+from .views import generate_church_pdf_task
+
+
+class ChurchReportSummaryTest(TestCase):
+    """Test cases for the church report's pickup/delivery summary."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        category = Category.objects.create(name="Church", slug="church", product_type="church")
+        cls.shirt = Church.objects.create(
+            name="Quality RCCG Shirt",
+            category=category,
+            church="RCCG",
+            price=Decimal("8000.00")
+        )
+        content_type = ContentType.objects.get_for_model(Church)
+
+        # Older checkouts stored the flag as strings and numbers too
+        pickup_values = [True, "true", 1, False, None]
+        for quantity, pickup_on_camp in enumerate(pickup_values, start=1):
+            delivery_details = {} if pickup_on_camp is None else {"pickup_on_camp": pickup_on_camp}
+            order = Order.objects.create(
+                first_name="John",
+                last_name="Doe",
+                email="john@example.com",
+                phone_number="08012345678",
+                total_cost=Decimal("0.00"),
+                delivery_details=delivery_details,
+                paid=True
+            )
+            OrderItem.objects.create(
+                order=order,
+                content_type=content_type,
+                object_id=cls.shirt.id,
+                price=Decimal("8000.00"),
+                quantity=quantity,
+                extra_fields={"size": "L"}
+            )
+
+    @patch('orderitem_generation.views.send_report_email')
+    @patch('orderitem_generation.views.render_pdf')
+    @patch('orderitem_generation.views.render_to_string', return_value="<html></html>")
+    def test_summary_counts_pickup_by_truthiness(self, mock_render, mock_pdf, mock_send):
+        """Test that any truthy pickup_on_camp value counts as pickup."""
+        generate_church_pdf_task.now("RCCG", "admin@example.com")
+
+        context = mock_render.call_args[0][1]
+        self.assertEqual(context["summary_data"], [{
+            "product_name": "Quality RCCG Shirt",
+            "size": "L",
+            "total_quantity": 15,
+            "pickup_count": 6,
+            "delivery_count": 9,
+        }])
+        self.assertEqual(
+            context["totals"],
+            {"total_quantity": 15, "pickup_count": 6, "delivery_count": 9}
+        )
+        mock_send.assert_called_once()
@@ -0,0 +1,78 @@
+"""
+Delivery of the generated order reports.
+
+Report PDFs are uploaded to Cloudinary as private raw files and the staff
+member gets a time-limited signed download link by email, instead of the
+whole PDF riding along as an attachment. If the upload fails the report is
+attached to the email as before.
+"""
+import time
+import uuid
+import cloudinary.uploader
+import cloudinary.utils
+from django.conf import settings
+from jmw.background_utils import send_email_async
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def upload_report_pdf(filename, pdf_file):
+    """
+    Upload a report PDF to Cloudinary and return a signed download URL.
+
+    The file is stored as a private raw resource under reports/, so the
+    URL is the only way to fetch it and it stops working after
+    REPORT_DOWNLOAD_LINK_EXPIRY seconds.
+    """
+    public_id = f"reports/{uuid.uuid4().hex}/{filename.replace(' ', '_')}"
+    cloudinary.uploader.upload(
+        pdf_file,
+        filename=filename,
+        public_id=public_id,
+        resource_type="raw",
+        type="private",
+    )
+    return cloudinary.utils.private_download_url(
+        public_id,
+        None,
+        resource_type="raw",
+        type="private",
+        attachment=True,
+        expires_at=int(time.time()) + settings.REPORT_DOWNLOAD_LINK_EXPIRY,
+    )
+
+
+def send_report_email(subject, message, filename, pdf_file, recipient_email):
+    """
+    Email a report to staff as a download link, falling back to an attachment.
+
+    Args:
+        subject: Email subject
+        message: Email body (the link is appended to it)
+        filename: PDF file name
+        pdf_file: Open PDF file, positioned at the start
+        recipient_email: Email to send the report to
+    """
+    try:
+        url = upload_report_pdf(filename, pdf_file)
+    except Exception as e:
+        logger.error(f"Error uploading report {filename}, attaching it instead: {str(e)}")
+        pdf_file.seek(0)
+        pdf = pdf_file.read()
+        send_email_async(
+            subject=subject,
+            message=message,
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            recipient_list=[recipient_email],
+            attachments=[(filename, pdf, 'application/pdf')]
+        )
+        return
+
+    days = settings.REPORT_DOWNLOAD_LINK_EXPIRY // (60 * 60 * 24)
+    send_email_async(
+        subject=subject,
+        message=f"{message}\n\nDownload: {url}\n\nThis link expires in {days} day(s).",
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        recipient_list=[recipient_email],
+    )
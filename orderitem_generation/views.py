@@ -1,14 +1,19 @@
+from collections import defaultdict
+from functools import lru_cache
 from django.db import models
-from django.db.models import Count, Sum
+from django.db.models import Count, F, OuterRef, Subquery, Sum, Window
+from django.db.models.functions import RowNumber
 from django.template.loader import render_to_string
 from django.http import HttpResponse
 from django.contrib.contenttypes.models import ContentType
+from django.contrib.contenttypes.prefetch import GenericPrefetch
 from django.contrib.auth import get_user_model
 from django.conf import settings
 from rest_framework import views, permissions, status
 from rest_framework.response import Response
 from background_task import background
-from jmw.background_utils import send_email_async
+from .pdf_backend import render_pdf
+from .utils import send_report_email
 import logging
 
 from order.models import OrderItem
@@ -19,8 +24,69 @@ from products.constants import STATES, CHURCH_CHOICES
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
+# Report PDFs run on their own background_task queue so a dedicated worker
+# (`python manage.py process_tasks --queue pdf_queue`) can pick them up
+# without waiting behind other jobs.
+PDF_QUEUE = "pdf_queue"
 
-@background(schedule=0)
+# WeasyPrint's table layout slows down sharply as a table grows, so the
+# NYSC Kit report's kakhi measurement table is rendered in chunks this size
+KAKHI_ROWS_PER_SECTION = 500
+
+KAKHI_MEASUREMENT_FIELDS = (
+    "user_id",
+    "top_length",
+    "shoulder",
+    "chest",
+    "sleeve_length",
+    "waist",
+    "hips",
+    "trouser_length",
+)
+
+
+@lru_cache(maxsize=None)
+def _ct(model):
+    """ContentType for a product model, looked up once per worker process"""
+    return ContentType.objects.get_for_model(model)
+
+
+def get_product_names(order_items):
+    """
+    Map (content_type_id, object_id) to product name for the given order items.
+
+    Issues one query per product type instead of resolving the generic
+    relation row by row.
+    """
+    ids_by_type = defaultdict(set)
+    for content_type_id, object_id in order_items.order_by().values_list("content_type", "object_id").distinct():
+        ids_by_type[content_type_id].add(object_id)
+
+    product_names = {}
+    for content_type_id, object_ids in ids_by_type.items():
+        model = ContentType.objects.get_for_id(content_type_id).model_class()
+        for pk, name in model.objects.filter(pk__in=object_ids).values_list("pk", "name"):
+            product_names[(content_type_id, pk)] = name
+    return product_names
+
+
+def get_latest_measurements(users):
+    """Map user id to that user's most recent measurement"""
+    latest = (
+        Measurement.objects.filter(user_id__in=[user.pk for user in users])
+        .annotate(
+            row_number=Window(
+                RowNumber(), partition_by=F("user_id"), order_by=F("created_at").desc()
+            )
+        )
+        .filter(row_number=1)
+        # Only the columns printed in the kakhi measurements table
+        .only(*KAKHI_MEASUREMENT_FIELDS)
+    )
+    return {measurement.user_id: measurement for measurement in latest}
+
+
+@background(schedule=0, queue=PDF_QUEUE)
 def generate_nysc_kit_pdf_task(state, recipient_email):
     """
     Background task to generate NYSC Kit PDF report and email to admin.
@@ -30,10 +96,8 @@ def generate_nysc_kit_pdf_task(state, recipient_email):
         recipient_email: Email to send the PDF to
     """
     try:
-        from weasyprint import HTML
-
         # Get ContentType for NyscKit
-        nysc_kit_type = ContentType.objects.get_for_model(NyscKit)
+        nysc_kit_type = _ct(NyscKit)
 
         # Filter for orders of type NyscKitOrder with matching state
         order_items = (
@@ -55,39 +119,35 @@ def generate_nysc_kit_pdf_task(state, recipient_email):
             return
 
         # Get all kakhi orders and their measurements
+        kakhi_ids = NyscKit.objects.filter(type="kakhi").values("id")
+        kakhi_orders = [
+            order_item.order
+            for order_item in order_items.filter(
+                content_type=nysc_kit_type, object_id__in=kakhi_ids
+            ).iterator(chunk_size=2000)
+        ]
+
+        # One query for the users and one for their latest measurements
+        users = User.objects.filter(
+            email__in={order.email for order in kakhi_orders}
+        ).in_bulk(field_name="email")
+        latest_measurements = get_latest_measurements(users.values())
+
         kakhi_measurements = []
-        counter = 1
-        for order_item in order_items:
-            if (
-                order_item.content_type == nysc_kit_type
-                and order_item.product.type == "kakhi"
-            ):
-                try:
-                    user = User.objects.get(email=order_item.order.email)
-                    measurement = (
-                        Measurement.objects.select_related("user")
-                        .filter(user=user)
-                        .order_by("-created_at")
-                        .first()
-                    )
-                    if measurement:
-                        kakhi_measurements.append(
-                            {
-                                "counter": counter,
-                                "name": f"{order_item.order.last_name} {order_item.order.first_name}",
-                                "measurement": measurement,
-                            }
-                        )
-                except User.DoesNotExist:
-                    pass
-            counter += 1
-
-        totals = order_items.aggregate(
-            grand_total_count=Count("id"), grand_total_sum=Sum("quantity")
-        )
+        for order in kakhi_orders:
+            user = users.get(order.email)
+            measurement = latest_measurements.get(user.pk) if user else None
+            if measurement:
+                kakhi_measurements.append(
+                    {
+                        "counter": len(kakhi_measurements) + 1,
+                        "name": f"{order.last_name} {order.first_name}",
+                        "measurement": measurement,
+                    }
+                )
 
         # LGA-level summary
-        summary_query = (
+        summary_query = list(
             order_items.values(
                 "content_type",
                 "object_id",
@@ -106,57 +166,63 @@ def generate_nysc_kit_pdf_task(state, recipient_email):
             )
         )
 
-        # Product-level summary
-        product_summary_query = (
-            order_items.values("content_type", "object_id", "extra_fields__size")
-            .annotate(
-                total_count=Count("id"),
-                total_sum=Sum("quantity"),
-            )
-            .order_by(
-                "content_type",
-                "object_id",
-                "extra_fields__size",
-            )
-        )
+        # Product-level summary and grand totals, rolled up from the LGA rows
+        product_summary_map = defaultdict(lambda: {"total_count": 0, "total_sum": 0})
+        for item in summary_query:
+            key = (item["content_type"], item["object_id"], item["extra_fields__size"])
+            product_summary_map[key]["total_count"] += item["total_count"]
+            product_summary_map[key]["total_sum"] += item["total_sum"]
+
+        def product_sort_key(key):
+            content_type, object_id, size = key
+            # Sizes compare as text so numeric and string sizes never mix
+            # types; NULL sizes sort last, as in the database ordering
+            return (content_type, object_id, size is None, "" if size is None else str(size))
+
+        product_summary_query = [
+            {
+                "content_type": key[0],
+                "object_id": key[1],
+                "extra_fields__size": key[2],
+                **product_summary_map[key],
+            }
+            for key in sorted(product_summary_map, key=product_sort_key)
+        ]
+
+        totals = {
+            "grand_total_count": sum(item["total_count"] for item in summary_query),
+            "grand_total_sum": sum(item["total_sum"] for item in summary_query),
+        }
 
         # Process summaries
+        product_names = get_product_names(order_items)
+
         processed_summary = []
         for item in summary_query:
-            order_item = order_items.filter(
-                content_type=item["content_type"], object_id=item["object_id"]
-            ).first()
-
-            if order_item:
-                processed_item = {
-                    "product__name": (
-                        order_item.product.name if order_item.product else ""
-                    ),
-                    "extra_fields__size": item["extra_fields__size"],
-                    "order__local_government": item[
-                        "order__delivery_details__local_government"
-                    ],
-                    "total_count": item["total_count"],
-                    "total_sum": item["total_sum"],
-                }
-                processed_summary.append(processed_item)
+            processed_item = {
+                "product__name": product_names.get(
+                    (item["content_type"], item["object_id"]), ""
+                ),
+                "extra_fields__size": item["extra_fields__size"],
+                "order__local_government": item[
+                    "order__delivery_details__local_government"
+                ],
+                "total_count": item["total_count"],
+                "total_sum": item["total_sum"],
+            }
+            processed_summary.append(processed_item)
 
         processed_product_summary = []
         for item in product_summary_query:
-            order_item = order_items.filter(
-                content_type=item["content_type"], object_id=item["object_id"]
-            ).first()
-
-            if order_item:
-                processed_item = {
-                    "product__name": (
-                        order_item.product.name if order_item.product else ""
-                    ),
-                    "extra_fields__size": item["extra_fields__size"],
-                    "total_count": item["total_count"],
-                    "total_sum": item["total_sum"],
-                }
-                processed_product_summary.append(processed_item)
+            processed_item = {
+                "product__name": product_names.get(
+                    (item["content_type"], item["object_id"]), ""
+                ),
+                "extra_fields__size": item["extra_fields__size"],
+                "total_count": item["total_count"],
+                "total_sum": item["total_sum"],
+            }
+            processed_product_summary.append(processed_item)
 
         context = {
             "state": state,
@@ -168,24 +234,28 @@ def generate_nysc_kit_pdf_task(state, recipient_email):
             "kakhi_measurements": kakhi_measurements,
         }
 
-        # Generate PDF
-        html_string = render_to_string("orderitem_generation/nysckit_state_template.html", context)
-        html = HTML(string=html_string)
-        pdf = html.write_pdf()
-
+        # Generate PDF, with the kakhi measurements split into sections
+        # of KAKHI_ROWS_PER_SECTION rows that are laid out separately
+        template = "orderitem_generation/nysckit_state_template.html"
+        html_strings = [
+            render_to_string(
+                template,
+                {
+                    **context,
+                    "kakhi_measurements": kakhi_measurements[start:start + KAKHI_ROWS_PER_SECTION],
+                    "continuation": start > 0,
+                },
+            )
+            for start in range(0, max(len(kakhi_measurements), 1), KAKHI_ROWS_PER_SECTION)
+        ]
         filename = f"{settings.COMPANY_SHORT_NAME}_NYSC_Kit_Order_{state}.pdf"
 
-        # Send email with PDF attachment
+        # Email a download link to the PDF
         subject = f"NYSC Kit Order Report - {state}"
-        message = f"Please find attached the NYSC Kit order report for {state}."
-
-        send_email_async(
-            subject=subject,
-            message=message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[recipient_email],
-            attachments=[(filename, pdf, 'application/pdf')]
-        )
+        message = f"The NYSC Kit order report for {state} is ready."
+
+        with render_pdf(*html_strings) as pdf_file:
+            send_report_email(subject, message, filename, pdf_file, recipient_email)
 
         logger.info(f"NYSC Kit PDF generated and sent for state: {state}")
 
@@ -193,7 +263,7 @@ def generate_nysc_kit_pdf_task(state, recipient_email):
         logger.error(f"Error generating NYSC Kit PDF for state {state}: {str(e)}")
 
 
-@background(schedule=0)
+@background(schedule=0, queue=PDF_QUEUE)
 def generate_nysc_tour_pdf_task(state, recipient_email):
     """
     Background task to generate NYSC Tour PDF report and email to admin.
@@ -203,13 +273,13 @@ def generate_nysc_tour_pdf_task(state, recipient_email):
         recipient_email: Email to send the PDF to
     """
     try:
-        from weasyprint import HTML
-
-        nysc_tour_type = ContentType.objects.get_for_model(NyscTour)
+        nysc_tour_type = _ct(NyscTour)
         tour_ids = NyscTour.objects.filter(name=state).values_list("id", flat=True)
 
-        order_items = OrderItem.objects.select_related("order", "content_type").filter(
-            order__paid=True, content_type=nysc_tour_type, object_id__in=tour_ids
+        order_items = (
+            OrderItem.objects.select_related("order", "content_type")
+            .filter(order__paid=True, content_type=nysc_tour_type, object_id__in=tour_ids)
+            .prefetch_related(GenericPrefetch("product", [NyscTour.objects.all()]))
         )
 
         if not order_items.exists():
@@ -223,22 +293,14 @@ def generate_nysc_tour_pdf_task(state, recipient_email):
 
         # Generate PDF
         html_string = render_to_string("orderitem_generation/nysctour_state_template.html", context)
-        html = HTML(string=html_string)
-        pdf = html.write_pdf()
-
         filename = f"{settings.COMPANY_SHORT_NAME}_NYSC_Tour_Order_{state}.pdf"
 
-        # Send email with PDF attachment
+        # Email a download link to the PDF
         subject = f"NYSC Tour Order Report - {state}"
-        message = f"Please find attached the NYSC Tour order report for {state}."
-
-        send_email_async(
-            subject=subject,
-            message=message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[recipient_email],
-            attachments=[(filename, pdf, 'application/pdf')]
-        )
+        message = f"The NYSC Tour order report for {state} is ready."
+
+        with render_pdf(html_string) as pdf_file:
+            send_report_email(subject, message, filename, pdf_file, recipient_email)
 
         logger.info(f"NYSC Tour PDF generated and sent for state: {state}")
 
@@ -246,7 +308,11 @@ def generate_nysc_tour_pdf_task(state, recipient_email):
         logger.error(f"Error generating NYSC Tour PDF for state {state}: {str(e)}")
 
 
-@background(schedule=0)
+def _picked_up_on_camp(item):
+    return bool(item.order.delivery_details.get("pickup_on_camp"))
+
+
+@background(schedule=0, queue=PDF_QUEUE)
 def generate_church_pdf_task(church, recipient_email):
     """
     Background task to generate Church order PDF report and email to admin.
@@ -256,39 +322,42 @@ def generate_church_pdf_task(church, recipient_email):
         recipient_email: Email to send the PDF to
     """
     try:
-        from weasyprint import HTML
-
-        church_type = ContentType.objects.get_for_model(Church)
+        church_type = _ct(Church)
         church_ids = Church.objects.filter(church=church).values_list("id", flat=True)
 
-        order_items = OrderItem.objects.select_related(
-            "order", "content_type"
-        ).filter(order__paid=True, content_type=church_type, object_id__in=church_ids)
+        product_name = Church.objects.filter(pk=OuterRef("object_id")).values("name")[:1]
+        order_items = (
+            OrderItem.objects.select_related("order", "content_type")
+            .filter(order__paid=True, content_type=church_type, object_id__in=church_ids)
+            .annotate(product_name=Subquery(product_name))
+        )
 
-        if not order_items.exists():
+        # Older checkouts stored pickup_on_camp as strings or numbers as
+        # well as booleans, so pickup is decided by Python truthiness (as
+        # the report always has) rather than by a JSON match in SQL. Sizes
+        # are compared as text so numeric sizes sort alongside string ones.
+        order_items_list = sorted(
+            order_items,
+            key=lambda item: (
+                item.product_name,
+                str(item.extra_fields.get("size", "")),
+                _picked_up_on_camp(item),
+            ),
+        )
+        if not order_items_list:
             logger.warning(f"No church orders found for: {church}")
             return
 
-        # Convert to list and sort
-        order_items_list = list(order_items)
-        order_items_list.sort(
-            key=lambda x: (
-                x.product.name,
-                x.extra_fields.get("size", ""),
-                x.order.delivery_details.get("pickup_on_camp"),
-            )
-        )
-
-        # Create summary data
+        # Summary by product and size, from the rows already loaded for the
+        # detailed table
         summary_data = {}
         for item in order_items_list:
-            product_name = item.product.name
             size = item.extra_fields.get("size", "N/A")
-            key = (product_name, size)
+            key = (item.product_name, size)
 
             if key not in summary_data:
                 summary_data[key] = {
-                    "product_name": product_name,
+                    "product_name": item.product_name,
                     "size": size,
                     "total_quantity": 0,
                     "pickup_count": 0,
@@ -296,13 +365,13 @@ def generate_church_pdf_task(church, recipient_email):
                 }
 
             summary_data[key]["total_quantity"] += item.quantity
-            if item.order.delivery_details.get("pickup_on_camp"):
+            if _picked_up_on_camp(item):
                 summary_data[key]["pickup_count"] += item.quantity
             else:
                 summary_data[key]["delivery_count"] += item.quantity
 
         sorted_summary = sorted(
-            summary_data.values(), key=lambda x: (x["product_name"], x["size"])
+            summary_data.values(), key=lambda row: (row["product_name"], str(row["size"]))
         )
 
         totals = {
@@ -320,22 +389,14 @@ def generate_church_pdf_task(church, recipient_email):
 
         # Generate PDF
         html_string = render_to_string("orderitem_generation/church_state_template.html", context)
-        html = HTML(string=html_string)
-        pdf = html.write_pdf()
-
         filename = f"{settings.COMPANY_SHORT_NAME}_Church_Order_{church}.pdf"
 
-        # Send email with PDF attachment
+        # Email a download link to the PDF
         subject = f"Church Order Report - {church}"
-        message = f"Please find attached the church order report for {church}."
-
-        send_email_async(
-            subject=subject,
-            message=message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[recipient_email],
-            attachments=[(filename, pdf, 'application/pdf')]
-        )
+        message = f"The church order report for {church} is ready."
+
+        with render_pdf(html_string) as pdf_file:
+            send_report_email(subject, message, filename, pdf_file, recipient_email)
 
         logger.info(f"Church PDF generated and sent for: {church}")
 
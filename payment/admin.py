@@ -7,13 +7,13 @@ class PaymentTransactionAdmin(admin.ModelAdmin):
     list_display = ["reference", "amount", "email", "status", "created"]
     list_filter = ["status", "created"]
     search_fields = ["reference", "email"]
-    readonly_fields = ["reference", "created", "modified", "orders"]
+    readonly_fields = ["reference", "created", "modified", "order"]
 
     fieldsets = (
         (None, {"fields": ("reference", "amount", "email", "status")}),
         (
             "Order Information",
-            {"fields": ("orders",), "description": "Related orders for this payment"},
+            {"fields": ("order",), "description": "Order paid for by this payment"},
         ),
         ("Timestamps", {"fields": ("created", "modified"), "classes": ("collapse",)}),
     )
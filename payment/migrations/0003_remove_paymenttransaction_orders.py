@@ -0,0 +1,39 @@
+# Generated by Django 5.1.3 on 2026-10-16 16:20
+
+from django.db import migrations
+
+
+def copy_orders_to_order(apps, schema_editor):
+    """Carry the legacy M2M link onto the order FK before the M2M is dropped."""
+    PaymentTransaction = apps.get_model('payment', 'PaymentTransaction')
+    for payment in PaymentTransaction.objects.prefetch_related('orders'):
+        linked = list(payment.orders.all())
+        if len(linked) > 1:
+            raise RuntimeError(
+                f"Payment {payment.reference} is linked to {len(linked)} orders; "
+                "resolve it before removing PaymentTransaction.orders"
+            )
+        if linked and payment.order_id is None:
+            payment.order = linked[0]
+            payment.save(update_fields=['order'])
+
+
+def copy_order_to_orders(apps, schema_editor):
+    PaymentTransaction = apps.get_model('payment', 'PaymentTransaction')
+    for payment in PaymentTransaction.objects.exclude(order__isnull=True):
+        payment.orders.add(payment.order_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payment', '0002_paymenttransaction_order_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(copy_orders_to_order, copy_order_to_orders),
+        migrations.RemoveField(
+            model_name='paymenttransaction',
+            name='orders',
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.3 on 2026-10-16 16:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payment', '0003_remove_paymenttransaction_orders'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='paymenttransaction',
+            name='payment_paystack_ref_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='paymenttransaction',
+            constraint=models.UniqueConstraint(condition=models.Q(('paystack_reference__isnull', False), models.Q(('paystack_reference', ''), _negated=True)), fields=('paystack_reference',), name='uniq_paystack_ref'),
+        ),
+    ]
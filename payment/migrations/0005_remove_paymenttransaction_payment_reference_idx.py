@@ -0,0 +1,17 @@
+# Generated by Django 5.1.3 on 2026-10-16 17:10
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payment', '0004_remove_paymenttransaction_payment_paystack_ref_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='paymenttransaction',
+            name='payment_reference_idx',
+        ),
+    ]
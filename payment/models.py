@@ -1,8 +1,8 @@
 from django.db import models
+from django.db.models import Q
 from django.conf import settings
+import base64
 import uuid
-import random
-import string
 
 class PaymentTransaction(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -17,7 +17,7 @@ class PaymentTransaction(models.Model):
     created = models.DateTimeField(auto_now_add=True)
     modified = models.DateTimeField(auto_now=True)
 
-    # Primary order reference (single order per payment)
+    # Order paid for by this transaction (single order per payment)
     order = models.ForeignKey(
         "order.Order",
         on_delete=models.SET_NULL,
@@ -26,9 +26,6 @@ class PaymentTransaction(models.Model):
         related_name="payment_transactions"
     )
 
-    # Legacy support for multiple orders (keep for backwards compatibility)
-    orders = models.ManyToManyField("order.Order", related_name="payments", blank=True)
-
     # Paystack specific fields
     paystack_reference = models.CharField(max_length=100, blank=True, null=True, help_text="Paystack transaction reference")
     verified_at = models.DateTimeField(null=True, blank=True, help_text="Timestamp when payment was verified")
@@ -38,26 +35,37 @@ class PaymentTransaction(models.Model):
     class Meta:
         ordering = ["-created"]
         indexes = [
-            models.Index(fields=['reference'], name='payment_reference_idx'),
-            models.Index(fields=['paystack_reference'], name='payment_paystack_ref_idx'),
             models.Index(fields=['email'], name='payment_email_idx'),
             models.Index(fields=['status', '-created'], name='payment_status_created_idx'),
             models.Index(fields=['-created'], name='payment_created_idx'),
         ]
+        constraints = [
+            # Unset references are stored as NULL or '', so only real Paystack
+            # references take part in the uniqueness check
+            models.UniqueConstraint(
+                fields=['paystack_reference'],
+                condition=Q(paystack_reference__isnull=False) & ~Q(paystack_reference=''),
+                name='uniq_paystack_ref',
+            ),
+        ]
 
     def save(self, *args, **kwargs):
         if not self.reference:
-            prefix = settings.COMPANY_SHORT_NAME if hasattr(settings, 'COMPANY_SHORT_NAME') else 'JMW'
-            random_part = ''.join(random.choices(string.digits + string.ascii_uppercase, k=8))
-            self.reference = f"{prefix}-PAY-{random_part}"
-
-            # Ensure uniqueness
-            while PaymentTransaction.objects.filter(reference=self.reference).exists():
-                random_part = ''.join(random.choices(string.digits + string.ascii_uppercase, k=8))
-                self.reference = f"{prefix}-PAY-{random_part}"
+            self.reference = self.build_reference()
 
         super().save(*args, **kwargs)
 
+    def build_reference(self):
+        """Returns the reference for this transaction, usable before it is saved"""
+        prefix = settings.COMPANY_SHORT_NAME if hasattr(settings, 'COMPANY_SHORT_NAME') else 'JMW'
+        # Derived from the random UUID primary key, so there is no need to
+        # probe the table for a free value; the unique constraint catches
+        # the (negligible) chance of a collision. Ten bytes carry 74
+        # random bits (six are UUID version/variant) and encode to 16
+        # base32 characters without padding.
+        random_part = base64.b32encode(self.id.bytes[:10]).decode()
+        return f"{prefix}-PAY-{random_part}"
+
     def get_formatted_metadata(self):
         """Returns formatted metadata for display"""
         if not self.metadata:
@@ -11,4 +11,8 @@ class PaymentVerifySerializer(serializers.Serializer):
 class PaymentTransactionSerializer(serializers.ModelSerializer):
     class Meta:
         model = PaymentTransaction
-        fields = '__all__'
+        fields = [
+            'id', 'reference', 'amount', 'email', 'status', 'created', 'modified',
+            'order', 'paystack_reference', 'verified_at', 'metadata',
+        ]
+        read_only_fields = fields
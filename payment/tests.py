@@ -1,13 +1,16 @@
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase
 from django.contrib.auth import get_user_model
+from django.urls import reverse
 from django.utils import timezone
-from rest_framework.test import APITestCase
+from rest_framework.test import APIClient, APITestCase
 from rest_framework import status
 from decimal import Decimal
+from django.core.cache import cache
 from unittest.mock import patch, MagicMock
 
 from .models import PaymentTransaction
 from order.models import Order
+from jmw.background_utils import generate_payment_receipt_pdf_task
 
 User = get_user_model()
 
@@ -15,15 +18,16 @@ User = get_user_model()
 class PaymentTransactionModelTest(TestCase):
     """Test cases for the PaymentTransaction model."""
 
-    def setUp(self):
-        """Set up test data."""
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        cls.user = User.objects.create_user(
             username="testuser",
             email="test@example.com",
             password="testpass123"
         )
-        self.order = Order.objects.create(
-            user=self.user,
+        cls.order = Order.objects.create(
+            user=cls.user,
             first_name="John",
             last_name="Doe",
             email="john@example.com",
@@ -67,10 +71,13 @@ class PaymentTransactionModelTest(TestCase):
         )
         self.assertNotEqual(payment1.reference, payment2.reference)
 
+
+class PaymentTransactionUnitTest(SimpleTestCase):
+    """Model behaviour that needs no database rows."""
+
     def test_default_status_is_pending(self):
         """Test that default status is 'pending'."""
-        payment = PaymentTransaction.objects.create(
-            order=self.order,
+        payment = PaymentTransaction(
             amount=Decimal("5000.00"),
             email="john@example.com"
         )
@@ -78,28 +85,54 @@ class PaymentTransactionModelTest(TestCase):
 
     def test_payment_string_representation(self):
         """Test the string representation of a payment."""
-        payment = PaymentTransaction.objects.create(
-            order=self.order,
-            amount=Decimal("5000.00"),
-            email="john@example.com",
-            status='success'
-        )
-        expected = f"Payment {payment.reference} - success"
-        self.assertEqual(str(payment), expected)
+        payment = PaymentTransaction(reference="JMW-PAY-ABC", status='success')
+        self.assertEqual(str(payment), "Payment JMW-PAY-ABC - success")
 
 
 class PaymentAPITest(APITestCase):
     """Test cases for the Payment API endpoints."""
 
+    INITIALIZE_RESPONSE = {
+        'status': True,
+        'data': {
+            'authorization_url': 'https://paystack.com/pay/test',
+            'access_code': 'test_access_code',
+            'reference': 'test_reference'
+        }
+    }
+
+    @classmethod
+    def setUpClass(cls):
+        """Patch the Paystack client once for the whole class."""
+        super().setUpClass()
+        initialize_patcher = patch('payment.views.initialize_payment')
+        verify_patcher = patch('payment.views.verify_payment')
+        cls.mock_initialize = initialize_patcher.start()
+        cls.mock_verify = verify_patcher.start()
+        cls.addClassCleanup(initialize_patcher.stop)
+        cls.addClassCleanup(verify_patcher.stop)
+
+        # Client for the authenticated endpoints. It is kept out of
+        # setUpTestData, whose attributes are deep-copied for every test.
+        cls.auth_client = APIClient()
+        cls.auth_client.force_authenticate(user=cls.user)
+
     def setUp(self):
-        """Set up test data."""
-        self.user = User.objects.create_user(
+        """Start every test with fresh Paystack mocks."""
+        self.mock_initialize.reset_mock(return_value=True)
+        self.mock_verify.reset_mock(return_value=True)
+        self.mock_initialize.return_value = self.INITIALIZE_RESPONSE
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        cls.user = User.objects.create_user(
             username="testuser",
             email="test@example.com",
             password="testpass123"
         )
-        self.order = Order.objects.create(
-            user=self.user,
+        cls.order = Order.objects.create(
+            user=cls.user,
             first_name="John",
             last_name="Doe",
             email="john@example.com",
@@ -107,25 +140,18 @@ class PaymentAPITest(APITestCase):
             total_cost=Decimal("5000.00"),
             paid=False
         )
+        cls.initialize_url = reverse('payment:initialize')
+        cls.verify_url = reverse('payment:verify')
+        cls.transactions_url = reverse('payment:transaction-list')
 
-    @patch('payment.views.initialize_payment')
-    def test_initialize_payment(self, mock_initialize):
+    def test_initialize_payment(self):
         """Test initializing a payment."""
-        mock_initialize.return_value = {
-            'status': True,
-            'data': {
-                'authorization_url': 'https://paystack.com/pay/test',
-                'access_code': 'test_access_code',
-                'reference': 'test_reference'
-            }
-        }
-
         data = {
             'order_id': str(self.order.id),
             'email': 'john@example.com'
         }
 
-        response = self.client.post('/api/payment/initialize/', data)
+        response = self.client.post(self.initialize_url, data)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn('authorization_url', response.data)
@@ -135,8 +161,23 @@ class PaymentAPITest(APITestCase):
         self.assertEqual(payment.order, self.order)
         self.assertEqual(payment.status, 'pending')
 
-    @patch('payment.views.initialize_payment')
-    def test_initialize_payment_for_already_paid_order_fails(self, mock_initialize):
+    def test_initialize_payment_failure_records_failed_transaction(self):
+        """Test that a rejected initialization is stored once, as failed."""
+        self.mock_initialize.return_value = {'status': False, 'message': 'Invalid key'}
+
+        data = {
+            'order_id': str(self.order.id),
+            'email': 'john@example.com'
+        }
+
+        response = self.client.post(self.initialize_url, data)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        payment = PaymentTransaction.objects.get()
+        self.assertEqual(payment.status, 'failed')
+        self.assertEqual(payment.reference, self.mock_initialize.call_args[0][2])
+
+    def test_initialize_payment_for_already_paid_order_fails(self):
         """Test that initializing payment for already paid order fails."""
         self.order.paid = True
         self.order.save()
@@ -146,46 +187,86 @@ class PaymentAPITest(APITestCase):
             'email': 'john@example.com'
         }
 
-        response = self.client.post('/api/payment/initialize/', data)
+        response = self.client.post(self.initialize_url, data)
 
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn('already been paid', str(response.data))
 
-    @patch('payment.views.initialize_payment')
-    def test_idempotent_payment_initialization(self, mock_initialize):
+    def test_idempotent_payment_initialization(self):
         """Test idempotent payment initialization."""
         # Create existing pending transaction
-        existing_payment = PaymentTransaction.objects.create(
+        PaymentTransaction.objects.create(
             order=self.order,
             amount=Decimal("5000.00"),
             email="john@example.com",
             status='pending'
         )
 
-        mock_initialize.return_value = {
-            'status': True,
-            'data': {
-                'authorization_url': 'https://paystack.com/pay/test',
-                'access_code': 'test_access_code',
-                'reference': existing_payment.reference
-            }
+        data = {
+            'order_id': str(self.order.id),
+            'email': 'john@example.com'
         }
 
+        response = self.client.post(self.initialize_url, data)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # Should reuse existing transaction
+        self.assertEqual(PaymentTransaction.objects.count(), 1)
+
+    def test_recent_checkout_session_is_reused_without_paystack(self):
+        """Test that a retry within the reuse window skips Paystack."""
+        checkout = {
+            'authorization_url': 'https://paystack.com/pay/test',
+            'access_code': 'test_access_code',
+            'reference': 'JMW-PAY-EXISTING',
+        }
+        PaymentTransaction.objects.create(
+            order=self.order,
+            amount=Decimal("5000.00"),
+            email="john@example.com",
+            status='pending',
+            metadata={'paystack': checkout}
+        )
+
         data = {
             'order_id': str(self.order.id),
             'email': 'john@example.com'
         }
 
-        response = self.client.post('/api/payment/initialize/', data)
+        response = self.client.post(self.initialize_url, data)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        # Should reuse existing transaction
+        self.assertEqual(response.data, checkout)
+        self.mock_initialize.assert_not_called()
         self.assertEqual(PaymentTransaction.objects.count(), 1)
 
+    def test_checkout_session_not_reused_after_amount_changes(self):
+        """Test that a pending transaction for an old order total is not reused."""
+        PaymentTransaction.objects.create(
+            order=self.order,
+            amount=Decimal("4000.00"),
+            email="john@example.com",
+            status='pending',
+            metadata={'paystack': {'authorization_url': 'https://paystack.com/pay/old'}}
+        )
+
+        data = {
+            'order_id': str(self.order.id),
+            'email': 'john@example.com'
+        }
+
+        response = self.client.post(self.initialize_url, data)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, self.INITIALIZE_RESPONSE['data'])
+        self.assertEqual(self.mock_initialize.call_args[0][0], Decimal("5000.00"))
+        self.assertTrue(
+            PaymentTransaction.objects.filter(amount=Decimal("5000.00"), status='pending').exists()
+        )
+
     @patch('payment.views.send_payment_receipt_email_async')
     @patch('payment.views.generate_payment_receipt_pdf_task')
-    @patch('payment.views.verify_payment')
-    def test_verify_payment_success(self, mock_verify, mock_pdf, mock_email):
+    def test_verify_payment_success(self, mock_pdf, mock_email):
         """Test successful payment verification."""
         payment = PaymentTransaction.objects.create(
             order=self.order,
@@ -194,7 +275,7 @@ class PaymentAPITest(APITestCase):
             status='pending'
         )
 
-        mock_verify.return_value = {
+        self.mock_verify.return_value = {
             'status': True,
             'data': {
                 'status': 'success',
@@ -204,7 +285,8 @@ class PaymentAPITest(APITestCase):
         }
 
         data = {'reference': payment.reference}
-        response = self.client.post('/api/payment/verify/', data)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.verify_url, data)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn('success', response.data['status'])
@@ -222,8 +304,7 @@ class PaymentAPITest(APITestCase):
         mock_email.assert_called_once()
         mock_pdf.assert_called_once()
 
-    @patch('payment.views.verify_payment')
-    def test_verify_payment_idempotent(self, mock_verify):
+    def test_verify_payment_idempotent(self):
         """Test idempotent payment verification."""
         payment = PaymentTransaction.objects.create(
             order=self.order,
@@ -236,22 +317,21 @@ class PaymentAPITest(APITestCase):
         self.order.save()
 
         data = {'reference': payment.reference}
-        response = self.client.post('/api/payment/verify/', data)
+        response = self.client.post(self.verify_url, data)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn('already verified', response.data['message'])
 
-    @patch('payment.views.verify_payment')
-    def test_verify_payment_not_found(self, mock_verify):
+    def test_verify_payment_not_found(self):
         """Test verifying non-existent payment."""
         data = {'reference': 'NON_EXISTENT_REF'}
-        response = self.client.post('/api/payment/verify/', data)
+        response = self.client.post(self.verify_url, data)
 
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
     def test_payment_transaction_viewset_authentication(self):
         """Test that payment transaction viewset requires authentication."""
-        response = self.client.get('/api/payment/transactions/')
+        response = self.client.get(self.transactions_url)
         # Depending on your viewset permissions
         self.assertIn(response.status_code, [status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN])
 
@@ -271,21 +351,69 @@ class PaymentAPITest(APITestCase):
             total_cost=Decimal("3000.00")
         )
 
-        payment1 = PaymentTransaction.objects.create(
+        payment1 = PaymentTransaction(
             order=self.order,
             amount=Decimal("5000.00"),
             email="john@example.com"
         )
-        payment2 = PaymentTransaction.objects.create(
+        payment2 = PaymentTransaction(
             order=order2,
             amount=Decimal("3000.00"),
             email="jane@example.com"
         )
+        # bulk_create bypasses save(), so references are assigned up front
+        for payment in (payment1, payment2):
+            payment.reference = payment.build_reference()
+        PaymentTransaction.objects.bulk_create([payment1, payment2])
 
-        self.client.force_authenticate(user=self.user)
-        response = self.client.get('/api/payment/transactions/')
+        response = self.auth_client.get(self.transactions_url)
 
         if response.status_code == status.HTTP_200_OK:
             payment_ids = [p['id'] for p in response.data.get('results', response.data)]
             self.assertIn(str(payment1.id), payment_ids)
             self.assertNotIn(str(payment2.id), payment_ids)
+
+
+class PaymentReceiptTaskTest(TestCase):
+    """Test cases for the payment receipt background task."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        order = Order.objects.create(
+            first_name="John",
+            last_name="Doe",
+            email="john@example.com",
+            phone_number="08012345678",
+            total_cost=Decimal("5000.00")
+        )
+        cls.payment = PaymentTransaction.objects.create(
+            order=order,
+            amount=Decimal("5000.00"),
+            email="john@example.com",
+            status='success'
+        )
+
+    def setUp(self):
+        """Start every test with an empty receipt cache."""
+        cache.clear()
+
+    @patch('jmw.background_utils.send_with_shared_connection')
+    @patch('jmw.background_utils._render_payment_receipt_pdf')
+    def test_second_receipt_run_reuses_cached_pdf(self, mock_render, mock_send):
+        """Test that a repeated receipt run attaches the cached PDF instead of rendering."""
+        def write_pdf(context, target):
+            with open(target, 'wb') as pdf_file:
+                pdf_file.write(b'%PDF-receipt')
+
+        mock_render.side_effect = write_pdf
+
+        generate_payment_receipt_pdf_task.now(str(self.payment.id))
+        generate_payment_receipt_pdf_task.now(str(self.payment.id))
+
+        mock_render.assert_called_once()
+        self.assertEqual(mock_send.call_count, 2)
+        for call in mock_send.call_args_list:
+            email = call.args[0]
+            self.assertEqual(email.to, ["john@example.com"])
+            self.assertEqual(email.attachments[0][1], b'%PDF-receipt')
@@ -18,10 +18,15 @@ from jmw.background_utils import (
     send_payment_receipt_email_async, 
     generate_payment_receipt_pdf_task
 )
+from datetime import timedelta
 import logging
 
 logger = logging.getLogger(__name__)
 
+# How long a stored Paystack checkout session is handed back to a retrying
+# customer instead of initializing the transaction again
+PAYSTACK_CHECKOUT_REUSE_WINDOW = timedelta(minutes=30)
+
 
 class PaymentInitializeRateThrottle(AnonRateThrottle):
     """Rate limit for payment initialization (10 requests per hour)"""
@@ -33,6 +38,28 @@ class PaymentVerifyRateThrottle(UserRateThrottle):
     rate = '20/hour'
 
 
+def _checkout_session(data):
+    """The parts of a Paystack initialize response needed to resume checkout"""
+    return {key: data.get(key) for key in ('authorization_url', 'access_code', 'reference')}
+
+
+def _queue_payment_receipt(payment_transaction):
+    """Hand the receipt email and PDF for a verified payment to the background workers"""
+    # Send payment receipt email asynchronously
+    try:
+        send_payment_receipt_email_async(str(payment_transaction.id))
+        logger.info(f"Payment receipt email queued for payment: {payment_transaction.reference}")
+    except Exception as e:
+        logger.error(f"Failed to queue payment receipt email for {payment_transaction.reference}: {str(e)}")
+
+    # Queue PDF receipt generation in background
+    try:
+        generate_payment_receipt_pdf_task(str(payment_transaction.id))
+        logger.info(f"Payment receipt PDF task queued for payment: {payment_transaction.reference}")
+    except Exception as e:
+        logger.error(f"Failed to queue payment receipt PDF for {payment_transaction.reference}: {str(e)}")
+
+
 class InitializePaymentView(APIView):
     # ✅ Added: Allow anyone to initialize payment (for guest checkout)
     permission_classes = [permissions.AllowAny]
@@ -45,7 +72,12 @@ class InitializePaymentView(APIView):
             order_id = serializer.validated_data['order_id']
             email = serializer.validated_data['email']
 
-            order = get_object_or_404(Order, id=order_id)
+            # Only the columns initialization reads; the primary key lookup is
+            # already an index seek
+            order = get_object_or_404(
+                Order.objects.only('id', 'reference', 'total_cost', 'paid'),
+                id=order_id
+            )
 
             # Prevent duplicate payment initialization for already paid orders
             if order.paid:
@@ -54,14 +86,23 @@ class InitializePaymentView(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            # Check for existing pending transaction (idempotency)
+            # Check for existing pending transaction (idempotency). Only one
+            # for the order's current amount and this email is reused, so a
+            # changed cart never gets a checkout for the old total.
             existing_transaction = PaymentTransaction.objects.filter(
                 order=order,
+                email=email,
+                amount=order.total_cost,
                 status='pending'
             ).first()
 
             if existing_transaction:
                 logger.info(f"Reusing existing pending transaction: {existing_transaction.reference}")
+                # A recent checkout session is handed back without calling Paystack
+                checkout = existing_transaction.metadata.get('paystack')
+                if checkout and existing_transaction.modified >= timezone.now() - PAYSTACK_CHECKOUT_REUSE_WINDOW:
+                    return Response(checkout)
+
                 # Re-initialize with existing reference
                 callback_url = settings.PAYMENT_CALLBACK_URL
                 res = initialize_payment(
@@ -72,18 +113,19 @@ class InitializePaymentView(APIView):
                 )
 
                 if res and res.get('status'):
+                    existing_transaction.metadata['paystack'] = _checkout_session(res['data'])
+                    existing_transaction.save(update_fields=['metadata', 'modified'])
                     return Response(res['data'])
 
-            # Create new transaction record (reference auto-generated by model)
-            payment_transaction = PaymentTransaction.objects.create(
+            # Build the transaction in memory and insert it once, with the
+            # status Paystack's answer decides
+            payment_transaction = PaymentTransaction(
                 order=order,
                 amount=order.total_cost,
                 email=email,
                 status='pending'
             )
-
-            # Add to legacy orders M2M for backwards compatibility
-            payment_transaction.orders.add(order)
+            payment_transaction.reference = payment_transaction.build_reference()
 
             # Initialize Paystack payment
             callback_url = settings.PAYMENT_CALLBACK_URL
@@ -95,12 +137,14 @@ class InitializePaymentView(APIView):
             )
 
             if res and res.get('status'):
+                payment_transaction.metadata['paystack'] = _checkout_session(res['data'])
+                payment_transaction.save(force_insert=True)
                 logger.info(f"Payment initialized successfully: {payment_transaction.reference}")
                 return Response(res['data'])
 
-            # If initialization failed, mark transaction as failed
+            # If initialization failed, record the transaction as failed
             payment_transaction.status = 'failed'
-            payment_transaction.save()
+            payment_transaction.save(force_insert=True)
 
             logger.error(f"Payment initialization failed for order: {order.reference}")
             return Response(
@@ -122,9 +166,10 @@ class VerifyPaymentView(APIView):
         if serializer.is_valid():
             reference = serializer.validated_data['reference']
 
-            # Get payment transaction
+            # Lock the transaction row so duplicate callbacks for the same
+            # reference wait here and then see the verified status
             payment_transaction = get_object_or_404(
-                PaymentTransaction,
+                PaymentTransaction.objects.select_for_update(),
                 reference=reference
             )
 
@@ -144,31 +189,20 @@ class VerifyPaymentView(APIView):
 
                 if data.get('status') == 'success':
                     # Update payment transaction
+                    now = timezone.now()
                     payment_transaction.status = 'success'
-                    payment_transaction.verified_at = timezone.now()
-                    payment_transaction.save()
+                    payment_transaction.verified_at = now
+                    payment_transaction.save(update_fields=['status', 'verified_at', 'modified'])
 
-                    # Update order as paid
-                    order = payment_transaction.order
-                    order.paid = True
-                    order.status = 'paid'  
-                    order.save()
+                    # Mark the order paid in one UPDATE, without loading it
+                    Order.objects.filter(pk=payment_transaction.order_id).update(
+                        paid=True, status='paid', updated=now
+                    )
 
                     logger.info(f"Payment verified successfully: {reference}")
 
-                    # Send payment receipt email asynchronously
-                    try:
-                        send_payment_receipt_email_async(str(payment_transaction.id))
-                        logger.info(f"Payment receipt email queued for payment: {payment_transaction.reference}")
-                    except Exception as e:
-                        logger.error(f"Failed to queue payment receipt email for {payment_transaction.reference}: {str(e)}")
-
-                    # Queue PDF receipt generation in background
-                    try:
-                        generate_payment_receipt_pdf_task(str(payment_transaction.id))
-                        logger.info(f"Payment receipt PDF task queued for payment: {payment_transaction.reference}")
-                    except Exception as e:
-                        logger.error(f"Failed to queue payment receipt PDF for {payment_transaction.reference}: {str(e)}")
+                    # Receipts are queued once the verified status is committed
+                    transaction.on_commit(lambda: _queue_payment_receipt(payment_transaction))
 
                     return Response({
                         "status": "success",
@@ -177,7 +211,7 @@ class VerifyPaymentView(APIView):
 
             # Payment verification failed
             payment_transaction.status = 'failed'
-            payment_transaction.save()
+            payment_transaction.save(update_fields=['status', 'modified'])
 
             logger.warning(f"Payment verification failed: {reference}")
             return Response(
@@ -189,7 +223,9 @@ class VerifyPaymentView(APIView):
 
 
 class PaymentTransactionViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = PaymentTransaction.objects.select_related('order').prefetch_related('orders')
+    # The serializer renders order as its primary key, which DRF reads from
+    # order_id, so no related rows need to be loaded
+    queryset = PaymentTransaction.objects.all()
     serializer_class = PaymentTransactionSerializer
     # ✅ Added: Require authentication to list payment transactions
     permission_classes = [permissions.IsAuthenticated]
@@ -63,7 +63,7 @@ class BaseProductAdmin(admin.ModelAdmin):
 
 
 @admin.register(NyscKit)
-class NyscTourAdmin(BaseProductAdmin):
+class NyscKitAdmin(BaseProductAdmin):
     list_display = BaseProductAdmin.list_display + [
         "type",
         "slug",
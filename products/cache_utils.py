@@ -0,0 +1,23 @@
+# cache_utils.py
+import uuid
+from django.core.cache import cache
+
+CATEGORY_VERSION_CACHE_KEY = "products_category_version"
+CATEGORY_VERSION_CACHE_TIMEOUT = 300
+
+
+def get_category_version():
+    """Token that changes whenever a category is saved or deleted"""
+    return cache.get_or_set(
+        CATEGORY_VERSION_CACHE_KEY,
+        lambda: uuid.uuid4().hex,
+        CATEGORY_VERSION_CACHE_TIMEOUT,
+    )
+
+
+def bump_category_version():
+    """
+    Retire every category ETag at once. Queryset updates skip
+    Category.save, so the version also expires as a backstop.
+    """
+    cache.set(CATEGORY_VERSION_CACHE_KEY, uuid.uuid4().hex, CATEGORY_VERSION_CACHE_TIMEOUT)
@@ -1,6 +1,7 @@
 from django.db import models
 from django.urls import reverse
 import uuid
+from functools import lru_cache
 from cloudinary_storage.storage import MediaCloudinaryStorage
 from django.core.validators import MinValueValidator, URLValidator
 from django.core.exceptions import ValidationError
@@ -18,6 +19,13 @@ from .constants import (
     CATEGORY_NAME_CHOICES,
 )
 from django.db.models import Avg
+from .cache_utils import bump_category_version
+
+
+@lru_cache(maxsize=256)
+def slugify_name(name):
+    """Slug for a product name; names come from fixed choices, so each is slugified once per process"""
+    return slugify(name)
 
 
 class SoftDeleteQuerySet(QuerySet):
@@ -112,6 +120,16 @@ class Category(SoftDeleteModel):
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        bump_category_version()
+
+    def delete(self, *args, **kwargs):
+        # Soft deletes go through save(); hard deletes need their own bump
+        result = super().delete(*args, **kwargs)
+        bump_category_version()
+        return result
+
     def get_absolute_url(self):
         return reverse("products:product_list_by_category", args=[self.slug])
 
@@ -251,6 +269,15 @@ class NyscKit(BaseProduct):
         ]
         verbose_name = "nysckit"
         verbose_name_plural = "nysckits"
+        ordering = [
+            Case(
+                When(type="kakhi", then=0),
+                When(type="vest", then=2),
+                When(type="cap", then=1),
+                default=3,
+            ),
+            "type",
+        ]
 
     def __str__(self):
         return self.name
@@ -258,22 +285,11 @@ class NyscKit(BaseProduct):
     def save(self, *args, **kwargs):
         """Handles slug generation."""
         if not self.slug:
-            self.slug = slugify(self.name)
+            self.slug = slugify_name(self.name)
             if NyscKit.objects.filter(slug=self.slug).exists():
                 self.slug = f"{self.slug}-{uuid.uuid4().hex[:8]}"
         super().save(*args, **kwargs)
 
-    class Meta:
-        ordering = [
-            Case(
-                When(type="kakhi", then=0),
-                When(type="vest", then=2),
-                When(type="cap", then=1),
-                default=3,
-            ),
-            "type",
-        ]
-
     product_type = "nysc_kit"
 
     def get_absolute_url(self):
@@ -305,7 +321,7 @@ class NyscTour(BaseProduct):
     def save(self, *args, **kwargs):
         """Handles slug generation."""
         if not self.slug:
-            self.slug = slugify(self.name)
+            self.slug = slugify_name(self.name)
             if NyscTour.objects.filter(slug=self.slug).exists():
                 self.slug = f"{self.slug}-{uuid.uuid4().hex[:8]}"
         super().save(*args, **kwargs)
@@ -342,7 +358,7 @@ class Church(BaseProduct):
     def save(self, *args, **kwargs):
         """Handles slug generation."""
         if not self.slug:
-            self.slug = slugify(self.name)
+            self.slug = slugify_name(self.name)
             if Church.objects.filter(slug=self.slug).exists():
                 self.slug = f"{self.slug}-{uuid.uuid4().hex[:8]}"
         super().save(*args, **kwargs)
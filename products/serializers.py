@@ -6,8 +6,25 @@ class CategorySerializer(serializers.ModelSerializer):
         model = Category
         fields = ['id', 'name', 'slug', 'product_type', 'description']
 
+class ProductCategorySerializer(CategorySerializer):
+    """
+    Category nested in product listings. Products on a page share a handful
+    of categories, so each one is serialized once per request and the
+    result reused for the rest of the rows.
+    """
+
+    def to_representation(self, instance):
+        cache = self.context.setdefault('category_representations', {})
+        if instance.pk not in cache:
+            cache[instance.pk] = super().to_representation(instance)
+        return cache[instance.pk]
+
 class BaseProductSerializer(serializers.ModelSerializer):
-    category = CategorySerializer(read_only=True)
+    """
+    Shared product fields. The nested category is read from each instance,
+    so querysets passed in should select_related or prefetch_related it.
+    """
+    category = ProductCategorySerializer(read_only=True)
     
     class Meta:
         fields = [
@@ -12,9 +12,10 @@ User = get_user_model()
 class CategoryModelTest(TestCase):
     """Test cases for the Category model."""
 
-    def setUp(self):
-        """Set up test data."""
-        self.category = Category.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        cls.category = Category.objects.create(
             name="NYSC Kit",
             slug="nysc-kit",
             product_type="nysc_kit",
@@ -64,16 +65,17 @@ class CategoryModelTest(TestCase):
 class NyscKitModelTest(TestCase):
     """Test cases for the NyscKit model."""
 
-    def setUp(self):
-        """Set up test data."""
-        self.category = Category.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        cls.category = Category.objects.create(
             name="NYSC Kit",
             slug="nysc-kit",
             product_type="nysc_kit"
         )
-        self.nysc_kit = NyscKit.objects.create(
+        cls.nysc_kit = NyscKit.objects.create(
             name="White Short Sleeve",
-            category=self.category,
+            category=cls.category,
             type="kakhi",
             price=Decimal("5000.00"),
             description="NYSC white short sleeve shirt"
@@ -154,16 +156,17 @@ class NyscKitModelTest(TestCase):
 class NyscTourModelTest(TestCase):
     """Test cases for the NyscTour model."""
 
-    def setUp(self):
-        """Set up test data."""
-        self.category = Category.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        cls.category = Category.objects.create(
             name="NYSC Tour",
             slug="nysc-tour",
             product_type="nysc_tour"
         )
-        self.nysc_tour = NyscTour.objects.create(
+        cls.nysc_tour = NyscTour.objects.create(
             name="Abia",
-            category=self.category,
+            category=cls.category,
             price=Decimal("15000.00"),
             description="NYSC tour to Abia state"
         )
@@ -197,16 +200,17 @@ class NyscTourModelTest(TestCase):
 class ChurchModelTest(TestCase):
     """Test cases for the Church model."""
 
-    def setUp(self):
-        """Set up test data."""
-        self.category = Category.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        cls.category = Category.objects.create(
             name="Church",
             slug="church",
             product_type="church"
         )
-        self.church_product = Church.objects.create(
+        cls.church_product = Church.objects.create(
             name="Choir Robe",
-            category=self.category,
+            category=cls.category,
             church="rccg",
             price=Decimal("8000.00"),
             description="RCCG choir robe"
@@ -231,33 +235,34 @@ class ChurchModelTest(TestCase):
 class ProductQuerySetTest(TestCase):
     """Test cases for custom ProductQuerySet methods."""
 
-    def setUp(self):
-        """Set up test data."""
-        self.category = Category.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        cls.category = Category.objects.create(
             name="NYSC Kit",
             slug="nysc-kit",
             product_type="nysc_kit"
         )
-        self.available_kit = NyscKit.objects.create(
+        cls.available_kit = NyscKit.objects.create(
             name="Available Kit",
-            category=self.category,
+            category=cls.category,
             type="kakhi",
             price=Decimal("5000.00"),
             available=True,
             out_of_stock=False,
             description="Special testing product"  # ✅ ADD THIS LINE
         )
-        self.out_of_stock_kit = NyscKit.objects.create(
+        cls.out_of_stock_kit = NyscKit.objects.create(
             name="Out of Stock Kit",
-            category=self.category,
+            category=cls.category,
             type="vest",
             price=Decimal("3000.00"),
             available=True,
             out_of_stock=True
         )
-        self.unavailable_kit = NyscKit.objects.create(
+        cls.unavailable_kit = NyscKit.objects.create(
             name="Unavailable Kit",
-            category=self.category,
+            category=cls.category,
             type="cap",
             price=Decimal("2000.00"),
             available=False,
@@ -292,9 +297,10 @@ class ProductQuerySetTest(TestCase):
 class CategoryAPITest(APITestCase):
     """Test cases for the Category API endpoints."""
 
-    def setUp(self):
-        """Set up test data."""
-        self.category = Category.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        cls.category = Category.objects.create(
             name="NYSC Kit",
             slug="nysc-kit",
             product_type="nysc_kit",
@@ -322,6 +328,40 @@ class CategoryAPITest(APITestCase):
         response = self.client.get('/api/products/categories/?ordering=name')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_category_etag_not_modified(self):
+        """Test that a matching If-None-Match returns 304 until a category changes."""
+        url = f'/api/products/categories/{self.category.slug}/'
+        response = self.client.get(url)
+        etag = response['ETag']
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.category.description = "Updated description"
+        self.category.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['description'], "Updated description")
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_category_etag_matching_parses_header(self):
+        """Test that If-None-Match is compared tag by tag, including weak and * forms."""
+        url = f'/api/products/categories/{self.category.slug}/'
+        etag = self.client.get(url)['ETag']
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=f'"other", W/{etag}')
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=f'{etag[:-2]}"')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get('/api/products/categories/missing/', HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
     def test_category_read_only(self):
         """Test that category endpoint is read-only."""
         data = {'name': 'New Category', 'slug': 'new-category', 'product_type': 'church'}
@@ -332,23 +372,24 @@ class CategoryAPITest(APITestCase):
 class NyscKitAPITest(APITestCase):
     """Test cases for the NyscKit API endpoints."""
 
-    def setUp(self):
-        """Set up test data."""
-        self.category = Category.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        cls.category = Category.objects.create(
             name="NYSC Kit",
             slug="nysc-kit",
             product_type="nysc_kit"
         )
-        self.nysc_kit = NyscKit.objects.create(
+        cls.nysc_kit = NyscKit.objects.create(
             name="White Short Sleeve",
-            category=self.category,
+            category=cls.category,
             type="kakhi",
             price=Decimal("5000.00"),
             available=True
         )
-        self.unavailable_kit = NyscKit.objects.create(
+        cls.unavailable_kit = NyscKit.objects.create(
             name="Unavailable Kit",
-            category=self.category,
+            category=cls.category,
             type="vest",
             price=Decimal("3000.00"),
             available=False
@@ -391,20 +432,40 @@ class NyscKitAPITest(APITestCase):
 
     def test_pagination(self):
         """Test pagination for NYSC Kits."""
-        # Create 25 kits to trigger pagination
-        for i in range(25):
-            NyscKit.objects.create(
+        # Create 25 kits to trigger pagination; bulk_create skips save(),
+        # so slugs are set here
+        NyscKit.objects.bulk_create([
+            NyscKit(
                 name=f"Kit {i}",
+                slug=f"kit-{i}",
                 category=self.category,
                 type="kakhi",
                 price=Decimal("5000.00")
             )
+            for i in range(25)
+        ])
         response = self.client.get('/api/products/nysc-kits/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn('results', response.data)
         self.assertIn('count', response.data)
         self.assertEqual(len(response.data['results']), 20)  # Default page size
 
+    def test_list_shares_category_representation(self):
+        """Test that products in one category carry the same category data."""
+        NyscKit.objects.create(
+            name="White Long Sleeve",
+            category=self.category,
+            type="kakhi",
+            price=Decimal("5000.00"),
+            available=True
+        )
+        response = self.client.get('/api/products/nysc-kits/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        categories = [product['category'] for product in response.data['results']]
+        self.assertEqual(len(categories), 2)
+        self.assertEqual(categories[0], categories[1])
+        self.assertEqual(categories[0]['slug'], "nysc-kit")
+
     def test_nysc_kit_read_only(self):
         """Test that NYSC Kit endpoint is read-only."""
         data = {
@@ -420,16 +481,17 @@ class NyscKitAPITest(APITestCase):
 class NyscTourAPITest(APITestCase):
     """Test cases for the NyscTour API endpoints."""
 
-    def setUp(self):
-        """Set up test data."""
-        self.category = Category.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        cls.category = Category.objects.create(
             name="NYSC Tour",
             slug="nysc-tour",
             product_type="nysc_tour"
         )
-        self.nysc_tour = NyscTour.objects.create(
+        cls.nysc_tour = NyscTour.objects.create(
             name="Abia",
-            category=self.category,
+            category=cls.category,
             price=Decimal("15000.00"),
             available=True
         )
@@ -459,16 +521,17 @@ class NyscTourAPITest(APITestCase):
 class ChurchAPITest(APITestCase):
     """Test cases for the Church API endpoints."""
 
-    def setUp(self):
-        """Set up test data."""
-        self.category = Category.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        cls.category = Category.objects.create(
             name="Church",
             slug="church",
             product_type="church"
         )
-        self.church_product = Church.objects.create(
+        cls.church_product = Church.objects.create(
             name="Quality RCCG Shirt",  # ✅ Use valid product name from CHURCH_PRODUCT_NAME
-            category=self.category,
+            category=cls.category,
             church="RCCG",  # ✅ Changed from "anglican" to "RCCG"
             price=Decimal("8000.00")
         )
@@ -502,9 +565,10 @@ class ChurchAPITest(APITestCase):
 class ProductsThrottlingTest(APITestCase):
     """Test cases for API rate limiting."""
 
-    def setUp(self):
-        """Set up test data."""
-        self.category = Category.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        cls.category = Category.objects.create(
             name="NYSC Kit",
             slug="nysc-kit",
             product_type="nysc_kit"
@@ -522,14 +586,15 @@ class ProductsThrottlingTest(APITestCase):
 class ProductsPermissionsTest(APITestCase):
     """Test cases for API permissions."""
 
-    def setUp(self):
-        """Set up test data."""
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        cls.user = User.objects.create_user(
             username="testuser",
             email="test@example.com",
             password="testpass123"
         )
-        self.category = Category.objects.create(
+        cls.category = Category.objects.create(
             name="NYSC Kit",
             slug="nysc-kit",
             product_type="nysc_kit"
@@ -1,7 +1,10 @@
-from rest_framework import viewsets, filters, permissions
+from rest_framework import viewsets, filters, permissions, status
+from rest_framework.response import Response
 from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
 from rest_framework.pagination import PageNumberPagination
+from django.utils.http import parse_etags
 from django_filters.rest_framework import DjangoFilterBackend
+from .cache_utils import get_category_version
 from .models import Category, NyscKit, NyscTour, Church
 from .serializers import (
     CategorySerializer,
@@ -39,10 +42,31 @@ class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
     ordering = ['name']
     lookup_field = 'slug'
 
-    def get_queryset(self):
-        """Prefetch related products for efficient queries"""
-        # ✅ Fixed: Use correct related_name (plural 's' not '_set')
-        return Category.objects.prefetch_related('nysckits', 'nysctours', 'churchs')
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(super().retrieve, request, *args, **kwargs)
+
+    def conditional_response(self, action, request, *args, **kwargs):
+        """
+        Categories change only through the admin, so responses are tagged
+        with the category version. A client whose If-None-Match holds that
+        ETag gets a 304 without the categories being queried or serialized.
+        """
+        etag = f'"{get_category_version()}"'
+        if_none_match = parse_etags(request.headers.get('If-None-Match', ''))
+        if any(tag.removeprefix('W/') == etag for tag in if_none_match):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+        response = action(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            # "*" matches any current representation, so it only applies
+            # once the category is known to exist
+            if '*' in if_none_match:
+                return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+            response['ETag'] = etag
+        return response
 
 
 class BaseProductViewSet(viewsets.ReadOnlyModelViewSet):
@@ -61,7 +85,12 @@ class BaseProductViewSet(viewsets.ReadOnlyModelViewSet):
 
     def get_queryset(self):
         """Filter to only show available products and optimize queries"""
-        return super().get_queryset().select_related('category').filter(available=True)
+        queryset = super().get_queryset().filter(available=True)
+        if self.action == 'list':
+            # A page shares a few categories; fetching them once by id beats
+            # repeating every category column on each joined product row
+            return queryset.prefetch_related('category')
+        return queryset.select_related('category')
 
 
 class NyscKitViewSet(BaseProductViewSet):
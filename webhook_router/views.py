@@ -15,7 +15,10 @@ def router_webhook(request):
     try:
         payload = json.loads(request.body)
         reference = payload.get("data", {}).get("reference", "")
-        
+
+        # Handed to the target view so the body is only decoded once
+        request.webhook_payload = payload
+
         # Route to bulk orders if reference starts with ORDER-
         if reference.startswith("ORDER-"):
             return bulk_orders_views.bulk_order_payment_webhook(request)